@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the backend test scripts
+"""
+
+import threading
+import uuid
+from functools import lru_cache
+
+import requests
+
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _register(base_url):
+    email = f"shared_{uuid.uuid4().hex[:8]}@example.com"
+    password = "SharedPassword123!"
+    response = requests.post(
+        f"{base_url}/auth/register",
+        json={"email": email, "password": password, "name": "Shared Test User"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return email, password, response.json()["token"]
+
+
+def get_shared_user(base_url):
+    """Register one throwaway user per process and return (email, password, token).
+
+    Scripts that only need *an* authenticated user should use this instead of
+    registering their own, so the server hashes one password per run instead
+    of one per script. Scripts that mutate the account (e.g. the password
+    reset flow) must keep registering their own user.
+    """
+    with _lock:
+        return _register(base_url)
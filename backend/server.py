@@ -1,22 +1,35 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+from pymongo import AsyncMongoClient, ReturnDocument, UpdateOne, WriteConcern
+from pymongo.errors import DuplicateKeyError
+import time
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr, ValidationError
-from typing import Optional, List, Dict, Any
-import uuid
+from pydantic import BaseModel, Field, StringConstraints, ValidationError
+from typing import Annotated, Optional, List, Dict, Any
+import secrets
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError
+from cachetools import TTLCache
 import jwt
 from jwt.exceptions import PyJWTError, ExpiredSignatureError
 from bson import ObjectId
+from bson.errors import InvalidId
 import math
+import re
+import json
+import hmac
+import hashlib
+import asyncio
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 import base64
 
@@ -28,40 +41,293 @@ load_dotenv(ROOT_DIR / '.env')
 mongo_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 db_name = os.getenv("DB_NAME", "Medious")
 
-client = AsyncIOMotorClient(mongo_url)
+# Explicit pool sizing keeps warm connections through traffic bursts, and
+# wire compression shrinks the user/post documents coming off the DB node.
+# Pool bounds are env-tunable so deploys can pin them to expected concurrent
+# DB ops; socketTimeoutMS bounds a stuck query instead of leaking the socket.
+# AsyncMongoClient is pymongo's native asyncio driver — unlike Motor there is
+# no thread-pool hop per operation.
+client = AsyncMongoClient(
+    mongo_url,
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "200")),
+    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "20")),
+    compressors="zstd,snappy,zlib",
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=2000,
+    socketTimeoutMS=10000,
+    maxIdleTimeMS=30000,
+    waitQueueTimeoutMS=2000,
+)
 db = client[db_name]
 
+# Chat messages are high-volume and tolerable to lose on a failover —
+# acknowledge from the primary only instead of waiting on replication
+event_chats_w1 = db.event_chats.with_options(write_concern=WriteConcern(w=1))
+
 # Lifespan event handler
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup - Create indexes
+    # Startup - Create indexes, then backfill behind the running app
     await create_indexes()
+    backfill_task = asyncio.create_task(run_backfills())
     yield
     # Shutdown
-    client.close()
+    backfill_task.cancel()
+    hash_pool.shutdown(wait=False)
+    await client.close()
 
 async def create_indexes():
     """Create necessary MongoDB indexes on startup"""
     try:
-        # Geospatial index for nearby users
-        await db.users.create_index([("location", "2dsphere")], background=True)
+        # Independent DDL — run concurrently instead of serializing startup
+        await asyncio.gather(
+            # Unique lookups for auth endpoints (login/register/supabase-sync).
+            # supabase_user_id is partial rather than sparse: email-auth users
+            # store an explicit null, which a sparse index would still index
+            # (and collide on).
+            db.users.create_index("email", unique=True, background=True),
+            db.users.create_index(
+                "supabase_user_id",
+                unique=True,
+                partialFilterExpression={"supabase_user_id": {"$type": "string"}},
+                background=True,
+            ),
+            # Reset-password lookup (expired tokens are $unset on use — no TTL
+            # index here, a TTL on users would delete the whole account)
+            db.users.create_index([("email", 1), ("reset_token", 1)], background=True),
+
+            # Geospatial indexes for nearby users and event radius search
+            db.users.create_index([("location", "2dsphere")], background=True),
+            db.events.create_index([("location", "2dsphere")], background=True),
+
+            # Event listing filters
+            db.events.create_index([("category", 1), ("start_date", 1)], background=True),
+
+            # Text indexes backing /search — unanchored case-insensitive
+            # $regex can't use an index and scans the whole collection
+            db.users.create_index([("name", "text"), ("email", "text")], background=True),
+            # Lowercase copies backing the anchored prefix fallback in /search
+            db.users.create_index("name_lc", background=True),
+            db.users.create_index("email_lc", background=True),
+            db.events.create_index(
+                [("title", "text"), ("description", "text"), ("category", "text")],
+                weights={"title": 10, "category": 5, "description": 1},
+                background=True,
+            ),
+
+            # TTL index for auto-expiring stories (24 hours), plus the feed query
+            db.stories.create_index("expires_at", expireAfterSeconds=0, background=True),
+            db.stories.create_index([("user_id", 1), ("expires_at", 1)], background=True),
+
+            # Feed and comment listing. _id joins the posts compound so the
+            # feed's (created_at, _id) tiebreak sort can merge straight from
+            # the per-author index scans instead of a blocking SORT stage
+            db.posts.create_index(
+                [("user_id", 1), ("created_at", -1), ("_id", -1)], background=True
+            ),
+            db.comments.create_index([("post_id", 1), ("created_at", 1)], background=True),
+
+            # Follows: compound unique doubles as the follower_id lookup and
+            # blocks duplicate follow documents; single index for the reverse
+            db.follows.create_index(
+                [("follower_id", 1), ("following_id", 1)], unique=True, background=True
+            ),
+            db.follows.create_index("following_id", background=True),
+
+            # Chat history and unread counts
+            db.messages.create_index(
+                [("sender_id", 1), ("receiver_id", 1), ("created_at", 1)], background=True
+            ),
+            # Symmetric pair: thread and conversation queries match on
+            # $or of both directions, and each branch needs its own
+            # index-covered prefix to avoid a collection scan
+            db.messages.create_index(
+                [("receiver_id", 1), ("sender_id", 1), ("created_at", 1)], background=True
+            ),
+            db.messages.create_index([("receiver_id", 1), ("read", 1)], background=True),
+            db.event_chats.create_index([("event_id", 1), ("created_at", 1)], background=True),
+        )
 
-        # TTL index for auto-expiring stories (24 hours)
-        await db.stories.create_index("expires_at", expireAfterSeconds=0, background=True)
+        logging.info("MongoDB indexes created successfully")
+    except Exception as e:
+        logging.warning(f"Error creating indexes (may already exist): {e}")
 
-        # Index for faster feed queries
-        await db.posts.create_index([("user_id", 1), ("created_at", -1)], background=True)
+async def backfill_follow_counters():
+    """One-time backfill for user documents that predate the denormalized
+    follow counters. Runs as a background task after startup.
 
-        # Indexes for follows lookups
-        await db.follows.create_index("follower_id", background=True)
-        await db.follows.create_index("following_id", background=True)
+    Field presence can't identify processed docs: live follows $inc the
+    counters unconditionally, and on a legacy doc $inc *creates* the field
+    at +-1. New accounts are therefore written with counters_backfilled set
+    and everyone else is recounted here. Each update re-asserts the counter
+    values seen at read time, so a follow racing the count simply leaves
+    the doc unmarked for the next startup instead of being lost."""
+    try:
+        ops = []
+        async for user in db.users.find(
+            {"counters_backfilled": {"$exists": False}},
+            projection={"followers_count": 1, "following_count": 1}
+        ):
+            uid = str(user["_id"])
+            followers, following = await asyncio.gather(
+                db.follows.count_documents({"following_id": uid}),
+                db.follows.count_documents({"follower_id": uid}),
+            )
+            ops.append(UpdateOne(
+                {
+                    "_id": user["_id"],
+                    # None matches a missing field, so this is a
+                    # compare-and-swap against whatever we read
+                    "followers_count": user.get("followers_count"),
+                    "following_count": user.get("following_count"),
+                },
+                {"$set": {
+                    "followers_count": followers,
+                    "following_count": following,
+                    "counters_backfilled": True,
+                }}
+            ))
+            if len(ops) >= 500:
+                await db.users.bulk_write(ops)
+                ops = []
+        if ops:
+            await db.users.bulk_write(ops)
+        logging.info("Follow-counter backfill complete")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.warning(f"Follow-counter backfill failed (will retry next start): {e}")
+
+async def backfill_post_counters():
+    """Companion backfill for posts that predate the denormalized like and
+    comment counters.
+
+    likes_count is resynced from the stored array wherever it disagrees —
+    live likes mutate the array and counter in one atomic update, so any
+    mismatch (including a field $inc-created on a legacy doc) is stale and
+    the per-document recompute is race-free. comments_count has no local
+    array to fold, so legacy posts are identified by the absent
+    counters_backfilled marker (new posts are written with it) and updated
+    with the read-time value re-asserted, like the follow backfill."""
+    try:
+        # Single server-side pass — no documents cross the wire
+        await db.posts.update_many(
+            {"$expr": {"$ne": [
+                "$likes_count", {"$size": {"$ifNull": ["$likes", []]}}
+            ]}},
+            [{"$set": {"likes_count": {"$size": {"$ifNull": ["$likes", []]}}}}]
+        )
 
-        logging.info("MongoDB indexes created successfully")
+        ops = []
+        async for post in db.posts.find(
+            {"counters_backfilled": {"$exists": False}},
+            projection={"comments_count": 1}
+        ):
+            count = await db.comments.count_documents({"post_id": str(post["_id"])})
+            ops.append(UpdateOne(
+                {"_id": post["_id"], "comments_count": post.get("comments_count")},
+                {"$set": {"comments_count": count, "counters_backfilled": True}}
+            ))
+            if len(ops) >= 500:
+                await db.posts.bulk_write(ops)
+                ops = []
+        if ops:
+            await db.posts.bulk_write(ops)
+        logging.info("Post-counter backfill complete")
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        logging.warning(f"Error creating indexes (may already exist): {e}")
+        logging.warning(f"Post-counter backfill failed (will retry next start): {e}")
+
+async def backfill_event_locations():
+    """One-time backfill for events that predate the GeoJSON location
+    field. $geoNear only matches documents carrying the indexed point, so
+    without this pass pre-existing events never appear in lat/lng-filtered
+    listings. Single server-side pipeline update; repeated startups no-op."""
+    try:
+        await db.events.update_many(
+            {"location": {"$exists": False}},
+            [{"$set": {"location": {
+                "type": "Point",
+                "coordinates": ["$longitude", "$latitude"]
+            }}}]
+        )
+        logging.info("Event-location backfill complete")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.warning(f"Event-location backfill failed (will retry next start): {e}")
+
+async def backfill_event_counters():
+    """Resync events.attendees_count from the attendees array. Live RSVP
+    toggles mutate the array and counter in one atomic update, so any
+    mismatch — including a field $inc-created at +-1 on a legacy event —
+    is stale, exactly as with posts.likes_count. Folding from the event's
+    own array needs no marker and also heals already-drifted docs."""
+    try:
+        await db.events.update_many(
+            {"$expr": {"$ne": [
+                "$attendees_count", {"$size": {"$ifNull": ["$attendees", []]}}
+            ]}},
+            [{"$set": {"attendees_count": {"$size": {"$ifNull": ["$attendees", []]}}}}]
+        )
+        logging.info("Event-counter backfill complete")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.warning(f"Event-counter backfill failed (will retry next start): {e}")
+
+async def backfill_lowercase_names():
+    """One-time backfill of the name_lc/email_lc search keys for accounts
+    that predate the anchored-prefix search fallback. Single server-side
+    pipeline update; register/sync/profile-update maintain the fields for
+    everyone written since."""
+    try:
+        await db.users.update_many(
+            {"name_lc": {"$exists": False}},
+            [{"$set": {
+                "name_lc": {"$toLower": "$name"},
+                "email_lc": {"$toLower": "$email"},
+            }}]
+        )
+        logging.info("Lowercase name/email backfill complete")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.warning(f"Lowercase name/email backfill failed (will retry next start): {e}")
+
+async def run_backfills():
+    """All one-time backfills, sequenced so they don't compete for the pool"""
+    await backfill_event_locations()
+    await backfill_event_counters()
+    await backfill_lowercase_names()
+    await backfill_follow_counters()
+    await backfill_post_counters()
+
+# Password hashing with Argon2 (no 72-byte limit, more secure than bcrypt).
+# Parameters follow the RFC 9106 low-memory profile; argon2-cffi's libargon2
+# uses SIMD (AVX2/BLAKE2) so this is also faster per hash than stock bcrypt.
+# The hot path calls argon2-cffi's PasswordHasher directly — passlib's
+# CryptContext adds scheme-list walking and handler construction per call —
+# and pwd_context stays only as the fallback that verifies legacy bcrypt
+# hashes until their owners next log in.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
 
-# Password hashing with Argon2 (no 72-byte limit, more secure than bcrypt)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Argon2 takes ~100ms+ of CPU per hash, which would block the event loop and
+# serialize all logins. Run hashing/verification in a thread pool instead
+# (argon2-cffi releases the GIL, so threads scale across cores). Capping the
+# pool at core count keeps latency predictable under login bursts: excess
+# verifications queue instead of oversubscribing CPU and slowing every hash.
+hash_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("HASH_POOL_WORKERS", os.cpu_count() or 1))
+)
 
 # JWT Configuration
 JWT_SECRET = os.getenv("JWT_SECRET", "5fc008ec2a0038269653326085c7f918770401c57d2b1a05d303cfb37de4b427")
@@ -69,21 +335,23 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_HOURS = int(os.getenv("JWT_EXPIRATION_HOURS", 24))
 
 # Create the main app
-app = FastAPI(lifespan=lifespan)
+# orjson serializes our small dict payloads 2-5x faster than stdlib json
+# and handles datetime natively
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
 # ============= CUSTOM EXCEPTION HANDLERS =============
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={"detail": "Validation error", "errors": exc.errors()},
     )
 
 @app.exception_handler(ValidationError)
 async def pydantic_validation_exception_handler(request: Request, exc: ValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"detail": "Validation error", "errors": exc.errors()},
     )
@@ -91,7 +359,7 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logging.error(f"Unexpected error: {str(exc)}", exc_info=exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": str(exc)},
     )
@@ -99,26 +367,32 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # ============= AUTHENTICATION MODELS =============
+# Shape-only email check compiled once into pydantic-core's Rust regex.
+# EmailStr routes every request body through email-validator's Python IDN
+# parsing, which is measurable overhead on the auth endpoints; deliverability
+# was never checked either way.
+Email = Annotated[str, StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254)]
+
 class UserRegister(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
     name: str
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
 
 class ForgotPasswordRequest(BaseModel):
-    email: EmailStr
+    email: Email
 
 class ResetPasswordRequest(BaseModel):
-    email: EmailStr
+    email: Email
     reset_token: str
     new_password: str
 
 class SupabaseSyncRequest(BaseModel):
     supabase_user_id: str
-    email: EmailStr
+    email: Email
     auth_provider: str
     name: Optional[str] = None
     avatar: Optional[str] = None
@@ -264,39 +538,220 @@ class PaginatedPostsResponse(BaseModel):
     has_more: bool = False
 
 # ============= HELPER FUNCTIONS =============
+# Keep credential material out of query results that don't need it — less
+# BSON over the wire and no chance of a hash leaking into a response
+USER_SAFE_PROJECTION = {"password_hash": 0, "reset_token": 0, "reset_expiry": 0}
+
+# Inclusion variant for $lookup pipelines: just the fields user_to_dict
+# reads, so joined user docs come back minimal instead of whole documents
+PUBLIC_USER_FIELDS = {
+    "name": 1, "email": 1, "avatar": 1, "bio": 1,
+    "followers_count": 1, "following_count": 1,
+    "location_sharing_enabled": 1
+}
+
+def utcnow() -> datetime:
+    """One timestamp per handler: bind `now = utcnow()` at the top and reuse
+    it for every created_at/updated_at instead of re-reading the clock"""
+    return datetime.now(timezone.utc)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except VerificationError:
+            return False
+    # Legacy (bcrypt) hashes go through passlib's multi-scheme context
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+# Opt-in short-TTL cache for Argon2 verifications: a hot account logging in
+# from several clients pays the ~20ms hash once instead of per request. Only
+# a boolean is stored, keyed by an HMAC of the inputs under the server
+# secret so neither passwords nor hashes sit in memory as cache keys.
+# Off by default — enabling it trades a 5s replay window for latency.
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "false").lower() == "true"
+_verify_cache = TTLCache(maxsize=10_000, ttl=5)
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    mac = hmac.new(JWT_SECRET.encode(), digestmod=hashlib.sha256)
+    mac.update(hashed_password.encode())
+    mac.update(b"\x00")
+    mac.update(plain_password.encode())
+    return mac.digest()[:16]
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop so other requests keep running"""
+    if AUTH_CACHE_ENABLED:
+        key = _verify_cache_key(plain_password, hashed_password)
+        cached = _verify_cache.get(key)
+        if cached is not None:
+            return cached
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(hash_pool, verify_password, plain_password, hashed_password)
+    if AUTH_CACHE_ENABLED:
+        _verify_cache[key] = result
+    return result
+
+async def aget_password_hash(password: str) -> str:
+    """Hash a password off the event loop so other requests keep running"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_pool, get_password_hash, password)
+
+# Tokens are minted on every register/login/sync. For the default HS256 the
+# header never changes and the HMAC key schedule can be reused via .copy(),
+# so precompute both instead of letting jwt.encode rebuild them per call.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_JWT_HMAC = hmac.new(JWT_SECRET.encode(), digestmod=hashlib.sha256)
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    # Raw UNIX seconds — jwt.encode would just convert a datetime back to
+    # this anyway, so skip the datetime/timedelta construction
+    to_encode.update({"exp": int(time.time()) + JWT_EXPIRATION_HOURS * 3600})
+
+    if JWT_ALGORITHM != "HS256":
+        return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+    payload_b64 = base64.urlsafe_b64encode(
+        json.dumps(to_encode, separators=(",", ":")).encode()
+    ).rstrip(b"=")
+    signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    signature_b64 = base64.urlsafe_b64encode(mac.digest()).rstrip(b"=")
+    return (signing_input + b"." + signature_b64).decode()
+
+def user_token_claims(user: dict) -> dict:
+    """Non-sensitive identity claims baked into the JWT so read-only auth
+    checks can answer from the token without a users lookup"""
+    return {
+        "user_id": str(user["_id"]),
+        "email": user["email"],
+        "name": user["name"],
+        "auth_provider": user["auth_provider"],
+        "avatar": user.get("avatar"),
+        "created_at": user["created_at"].isoformat(),
+    }
+
+# Decoded-claims cache: base64 + HMAC verification per request is redundant
+# work for tokens we have already seen. Keyed by a SHA-256 of the token so
+# raw bearer credentials never sit in the cache; the short TTL plus an
+# explicit exp check bound how long an expired token can linger.
+token_cache = TTLCache(maxsize=10_000, ttl=60)
+
+def _verify_hs256(token: str) -> dict:
+    """Mirror of the create_access_token fast path: split, re-sign with the
+    pre-keyed HMAC, constant-time compare, then parse the payload. Raises
+    ExpiredSignatureError/PyJWTError so callers see the same errors as
+    jwt.decode."""
+    try:
+        signing_input, _, signature_b64 = token.encode().rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        if header_b64 != _JWT_HEADER_B64:
+            # Foreign header (different alg, extra claims, …) — let PyJWT
+            # apply its full validation rules
+            return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        mac = _JWT_HMAC.copy()
+        mac.update(signing_input)
+        signature = base64.urlsafe_b64decode(signature_b64 + b"==")
+        if not hmac.compare_digest(mac.digest(), signature):
+            raise PyJWTError("Signature verification failed")
+        payload = json.loads(base64.urlsafe_b64decode(payload_b64 + b"=="))
+    except (ValueError, TypeError):
+        raise PyJWTError("Invalid token")
+    if payload.get("exp", 0) <= time.time():
+        raise ExpiredSignatureError("Signature has expired")
+    return payload
 
 def verify_token(token: str) -> dict:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        if payload["exp"] <= time.time():
+            raise HTTPException(status_code=401, detail="Token has expired")
+        return payload
+
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        if JWT_ALGORITHM == "HS256":
+            payload = _verify_hs256(token)
+        else:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        token_cache[cache_key] = payload
         return payload
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# Short-TTL cache for the per-request user lookup in get_current_user.
+# Hot users resolve from RAM instead of a Mongo round-trip; the 30s TTL
+# bounds staleness and writers invalidate explicitly via invalidate_user_cache.
+user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Per-user locks so a burst of requests arriving on a cold cache entry
+# results in one Mongo fetch, not one per request (miss coalescing)
+_user_fetch_locks: Dict[str, asyncio.Lock] = {}
+
+def invalidate_user_cache(user_id: str):
+    user_cache.pop(user_id, None)
+
+# Response caches for read-heavy GETs that re-run the same queries for
+# every viewer. In-process TTL caches like the user/token caches above
+# (no external cache tier in this deployment); results contain nothing
+# viewer-specific, so entries are shared across users after their own
+# auth passes. Chat entries are also dropped eagerly on new messages.
+search_cache = TTLCache(maxsize=2_000, ttl=60)
+event_chat_cache = TTLCache(maxsize=2_000, ttl=5)
+
+# Resolved following-id lists for the feed and story carousel — stable for
+# seconds at a time but re-fetched on every pageview otherwise. Invalidated
+# on follow/unfollow, so the TTL only bounds cross-worker staleness.
+following_cache = TTLCache(maxsize=10_000, ttl=30)
+
+async def get_following_ids(user_id: str) -> List[str]:
+    ids = following_cache.get(user_id)
+    if ids is None:
+        ids = await db.follows.distinct("following_id", {"follower_id": user_id})
+        following_cache[user_id] = ids
+    return ids
+
+def invalidate_event_chat_cache(event_id: str):
+    for key in [k for k in event_chat_cache if k[0] == event_id]:
+        event_chat_cache.pop(key, None)
+
+@lru_cache(maxsize=65536)
+def to_object_id(s: str) -> ObjectId:
+    """Memoized ObjectId parse — token user_ids repeat on every request,
+    so skip re-validating the same 24-char hex string each time"""
+    return ObjectId(s)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     payload = verify_token(token)
     user_id = payload.get("user_id")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+
+    user = user_cache.get(user_id)
+    if user is None:
+        lock = _user_fetch_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            # Re-check: a concurrent request may have populated the entry
+            # while this one waited on the lock
+            user = user_cache.get(user_id)
+            if user is None:
+                user = await db.users.find_one({"_id": to_object_id(user_id)}, projection=USER_SAFE_PROJECTION)
+                if user:
+                    user_cache[user_id] = user
+        _user_fetch_locks.pop(user_id, None)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
     return user
 
+
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two points in kilometers using Haversine formula"""
     R = 6371  # Earth's radius in kilometers
@@ -311,22 +766,25 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     
     return R * c
 
-async def user_to_dict(user: dict) -> dict:
-    """Convert user document to dictionary"""
-    followers_count = await db.follows.count_documents({"following_id": str(user["_id"])})
-    following_count = await db.follows.count_documents({"follower_id": str(user["_id"])})
-
+def user_to_dict(user: dict) -> dict:
+    """Convert user document to dictionary. Follower/following counts are
+    denormalized onto the user document and maintained by follow_user, so
+    this is pure field access — no queries, hence no need to be async."""
     return {
         "id": str(user["_id"]),
         "name": user["name"],
         "email": user["email"],
         "avatar": user.get("avatar"),
         "bio": user.get("bio"),
-        "followers_count": followers_count,
-        "following_count": following_count,
+        "followers_count": user.get("followers_count", 0),
+        "following_count": user.get("following_count", 0),
         "location_sharing_enabled": user.get("location_sharing_enabled", False)
     }
 
+def users_to_dict(users: List[dict]) -> Dict[str, dict]:
+    """Bulk user_to_dict. Returns a map of user id -> user dict."""
+    return {str(user["_id"]): user_to_dict(user) for user in users}
+
 def encode_cursor(created_at: datetime, post_id: str) -> str:
     """Encode cursor for pagination"""
     cursor_str = f"{created_at.isoformat()}|{post_id}"
@@ -341,27 +799,34 @@ def decode_cursor(cursor: str) -> tuple:
 # ============= AUTH ROUTES =============
 @api_router.post("/auth/register", response_model=AuthResponse)
 async def register(user_data: UserRegister):
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
+    now = utcnow()
     new_user = {
         "email": user_data.email,
-        "password_hash": get_password_hash(user_data.password),
+        "email_lc": user_data.email.lower(),
+        "password_hash": await aget_password_hash(user_data.password),
         "name": user_data.name,
+        "name_lc": user_data.name.lower(),
         "auth_provider": "email",
         "supabase_user_id": None,
         "avatar": None,
         "bio": None,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "followers_count": 0,
+        "following_count": 0,
+        "counters_backfilled": True,
+        "created_at": now,
+        "updated_at": now
     }
-    
-    result = await db.users.insert_one(new_user)
+
+    # The unique index on email makes the insert itself the existence check:
+    # one round-trip, and no race window between check and insert
+    try:
+        result = await db.users.insert_one(new_user)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     new_user["_id"] = result.inserted_id
-    token = create_access_token({"user_id": str(result.inserted_id)})
-    
-    user_dict = await user_to_dict(new_user)
+    token = create_access_token(user_token_claims(new_user))
+
+    user_dict = user_to_dict(new_user)
     return AuthResponse(
         token=token,
         user=UserResponse(**user_dict, auth_provider="email", created_at=new_user["created_at"])
@@ -369,7 +834,10 @@ async def register(user_data: UserRegister):
 
 @api_router.post("/auth/login", response_model=AuthResponse)
 async def login(credentials: UserLogin):
-    user = await db.users.find_one({"email": credentials.email})
+    user = await db.users.find_one(
+        {"email": credentials.email},
+        projection={"reset_token": 0, "reset_expiry": 0}
+    )
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
@@ -379,119 +847,157 @@ async def login(credentials: UserLogin):
             detail=f"This account uses {user['auth_provider']} login. Please use social login."
         )
     
-    if not verify_password(credentials.password, user["password_hash"]):
+    if not await averify_password(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    token = create_access_token({"user_id": str(user["_id"])})
-    user_dict = await user_to_dict(user)
+    token = create_access_token(user_token_claims(user))
+    user_dict = user_to_dict(user)
     
     return AuthResponse(
         token=token,
         user=UserResponse(**user_dict, auth_provider=user["auth_provider"], created_at=user["created_at"])
     )
 
+# Issued reset tokens mirrored in-process: the TTL matches the token's
+# one-hour expiry. Only used to *accept* fast and to pre-filter bogus
+# tokens cheaply — Mongo stays the source of truth, since tokens issued
+# by another worker (or before a restart) won't be in this cache.
+_reset_token_cache = TTLCache(maxsize=10_000, ttl=3600)
+
 @api_router.post("/auth/forgot-password")
 async def forgot_password(request: ForgotPasswordRequest):
-    user = await db.users.find_one({"email": request.email})
+    user = await db.users.find_one({"email": request.email}, projection={"_id": 1})
     if not user:
         return {"message": "If the email exists, a reset link has been sent"}
     
-    reset_token = str(uuid.uuid4())
-    reset_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+    reset_token = secrets.token_urlsafe(32)
+    reset_expiry = utcnow() + timedelta(hours=1)
     
     await db.users.update_one(
         {"_id": user["_id"]},
         {"$set": {"reset_token": reset_token, "reset_expiry": reset_expiry}}
     )
+    _reset_token_cache[reset_token] = request.email
     
     logging.info(f"Password reset token for {request.email}: {reset_token}")
     return {"message": "If the email exists, a reset link has been sent"}
 
 @api_router.post("/auth/reset-password")
 async def reset_password(request: ResetPasswordRequest):
-    user = await db.users.find_one({
-        "email": request.email,
-        "reset_token": request.reset_token,
-        "reset_expiry": {"$gt": datetime.now(timezone.utc)}
-    })
-    
-    if not user:
-        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
-    
-    await db.users.update_one(
-        {"_id": user["_id"]},
+    now = utcnow()
+
+    # Reject bad tokens before paying for an Argon2 hash: a brute-force
+    # probe should cost one dictionary lookup (or one {_id: 1} probe for
+    # tokens another worker issued), not a memory-hard hash
+    if _reset_token_cache.get(request.reset_token) != request.email:
+        candidate = await db.users.find_one(
+            {
+                "email": request.email,
+                "reset_token": request.reset_token,
+                "reset_expiry": {"$gt": now}
+            },
+            projection={"_id": 1}
+        )
+        if not candidate:
+            raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+
+    new_hash = await aget_password_hash(request.new_password)
+
+    # Single atomic round-trip: matching and consuming the token in one
+    # find_one_and_update closes the window where two concurrent requests
+    # could both pass a separate find-then-update check
+    user = await db.users.find_one_and_update(
+        {
+            "email": request.email,
+            "reset_token": request.reset_token,
+            "reset_expiry": {"$gt": now}
+        },
         {
-            "$set": {"password_hash": get_password_hash(request.new_password), "updated_at": datetime.now(timezone.utc)},
+            "$set": {"password_hash": new_hash, "updated_at": now},
             "$unset": {"reset_token": "", "reset_expiry": ""}
-        }
+        },
+        projection={"_id": 1}
     )
-    
+
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+    _reset_token_cache.pop(request.reset_token, None)
+    invalidate_user_cache(str(user["_id"]))
+
     return {"message": "Password has been reset successfully"}
 
 @api_router.post("/auth/supabase-sync", response_model=AuthResponse)
 async def supabase_sync(sync_data: SupabaseSyncRequest):
-    existing_user = await db.users.find_one({"supabase_user_id": sync_data.supabase_user_id})
-    
-    if existing_user:
-        token = create_access_token({"user_id": str(existing_user["_id"])})
-        user_dict = await user_to_dict(existing_user)
-        return AuthResponse(
-            token=token,
-            user=UserResponse(**user_dict, auth_provider=existing_user["auth_provider"], created_at=existing_user["created_at"])
-        )
-    
-    email_exists = await db.users.find_one({"email": sync_data.email})
-    if email_exists:
-        # Link the OAuth account to the existing user
-        await db.users.update_one(
-            {"_id": email_exists["_id"]},
-            {"$set": {
-                "supabase_user_id": sync_data.supabase_user_id,
+    now = utcnow()
+
+    try:
+        # One atomic round-trip covers both the returning-user and new-user
+        # cases: match on supabase_user_id, create via $setOnInsert if absent
+        user = await db.users.find_one_and_update(
+            {"supabase_user_id": sync_data.supabase_user_id},
+            {"$setOnInsert": {
+                "email": sync_data.email,
+                "email_lc": sync_data.email.lower(),
+                "password_hash": None,
+                "name": sync_data.name or sync_data.email.split('@')[0],
+                "name_lc": (sync_data.name or sync_data.email.split('@')[0]).lower(),
                 "auth_provider": sync_data.auth_provider,
-                "avatar": sync_data.avatar or email_exists.get("avatar"),
-                "name": sync_data.name or email_exists.get("name"),
-                "updated_at": datetime.now(timezone.utc),
-            }}
+                "avatar": sync_data.avatar,
+                "bio": None,
+                "followers_count": 0,
+                "following_count": 0,
+                "counters_backfilled": True,
+                "created_at": now,
+                "updated_at": now
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection=USER_SAFE_PROJECTION
         )
-        email_exists["supabase_user_id"] = sync_data.supabase_user_id
-        email_exists["auth_provider"] = sync_data.auth_provider
-        token = create_access_token({"user_id": str(email_exists["_id"])})
-        user_dict = await user_to_dict(email_exists)
-        return AuthResponse(
-            token=token,
-            user=UserResponse(**user_dict, auth_provider=sync_data.auth_provider, created_at=email_exists["created_at"])
+    except DuplicateKeyError:
+        # The unique email index blocked the upsert: the email belongs to an
+        # existing email/password account -- link the OAuth identity to it
+        link_fields = {
+            "supabase_user_id": sync_data.supabase_user_id,
+            "auth_provider": sync_data.auth_provider,
+            "updated_at": now,
+        }
+        if sync_data.name:
+            link_fields["name"] = sync_data.name
+            link_fields["name_lc"] = sync_data.name.lower()
+        if sync_data.avatar:
+            link_fields["avatar"] = sync_data.avatar
+
+        user = await db.users.find_one_and_update(
+            {"email": sync_data.email},
+            {"$set": link_fields},
+            return_document=ReturnDocument.AFTER,
+            projection=USER_SAFE_PROJECTION
         )
-    
-    new_user = {
-        "email": sync_data.email,
-        "password_hash": None,
-        "name": sync_data.name or sync_data.email.split('@')[0],
-        "auth_provider": sync_data.auth_provider,
-        "supabase_user_id": sync_data.supabase_user_id,
-        "avatar": sync_data.avatar,
-        "bio": None,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
-    }
-    
-    result = await db.users.insert_one(new_user)
-    new_user["_id"] = result.inserted_id
-    token = create_access_token({"user_id": str(result.inserted_id)})
-    user_dict = await user_to_dict(new_user)
-    
+        if not user:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        invalidate_user_cache(str(user["_id"]))
+
+    token = create_access_token(user_token_claims(user))
+    user_dict = user_to_dict(user)
+
     return AuthResponse(
         token=token,
-        user=UserResponse(**user_dict, auth_provider=new_user["auth_provider"], created_at=new_user["created_at"])
+        user=UserResponse(**user_dict, auth_provider=user["auth_provider"], created_at=user["created_at"])
     )
 
 @api_router.get("/auth/verify", response_model=UserResponse)
 async def verify_auth(current_user: dict = Depends(get_current_user)):
-    user_dict = await user_to_dict(current_user)
+    # Must stay DB-backed: the client hydrates its user state from this
+    # endpoint on launch and after profile edits, so a claims-only answer
+    # serves stale name/avatar and zeroed counters. The 30s user_cache in
+    # get_current_user already absorbs most of the lookup cost.
+    user_dict = user_to_dict(current_user)
     return UserResponse(**user_dict, auth_provider=current_user["auth_provider"], created_at=current_user["created_at"])
 
 @api_router.get("/users/profile", response_model=UserResponse)
 async def get_profile(current_user: dict = Depends(get_current_user)):
-    user_dict = await user_to_dict(current_user)
+    user_dict = user_to_dict(current_user)
     return UserResponse(**user_dict, auth_provider=current_user["auth_provider"], created_at=current_user["created_at"])
 
 @api_router.put("/users/profile", response_model=UserResponse)
@@ -499,9 +1005,10 @@ async def update_profile(
     profile: ProfileUpdate,
     current_user: dict = Depends(get_current_user)
 ):
-    update_data = {"updated_at": datetime.now(timezone.utc)}
+    update_data = {"updated_at": utcnow()}
     if profile.name:
         update_data["name"] = profile.name
+        update_data["name_lc"] = profile.name.lower()
     if profile.avatar:
         update_data["avatar"] = profile.avatar
     if profile.bio is not None:
@@ -511,49 +1018,79 @@ async def update_profile(
         if not profile.location_sharing_enabled:
             update_data["location"] = None  # Clear location when disabling
 
-    await db.users.update_one({"_id": current_user["_id"]}, {"$set": update_data})
-    updated_user = await db.users.find_one({"_id": current_user["_id"]})
-    user_dict = await user_to_dict(updated_user)
+    updated_user = await db.users.find_one_and_update(
+        {"_id": current_user["_id"]},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
+        projection=USER_SAFE_PROJECTION
+    )
+    invalidate_user_cache(str(current_user["_id"]))
+    user_dict = user_to_dict(updated_user)
     return UserResponse(**user_dict, auth_provider=updated_user["auth_provider"], created_at=updated_user["created_at"])
 
 @api_router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(user_id: str, current_user: dict = Depends(get_current_user)):
     try:
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-    except:
+        uid = ObjectId(user_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="User not found")
+
+    user = await db.users.find_one({"_id": uid}, projection=USER_SAFE_PROJECTION)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user_dict = await user_to_dict(user)
+    user_dict = user_to_dict(user)
     return UserResponse(**user_dict, auth_provider=user["auth_provider"], created_at=user["created_at"])
 
+def event_object_id(event_id: str) -> ObjectId:
+    """Validate the {event_id} path segment once at the dependency layer,
+    instead of a bare try/except ObjectId() inside every handler"""
+    try:
+        return ObjectId(event_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=404, detail="Event not found")
+
+async def load_event(event_oid: ObjectId = Depends(event_object_id)) -> dict:
+    """Fetch-or-404 shared by the /events/{event_id} handlers that need the
+    document itself — one lookup per request regardless of handler"""
+    event = await db.events.find_one({"_id": event_oid})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
 # ============= EVENT ROUTES =============
 @api_router.post("/events", response_model=EventResponse)
 async def create_event(event: EventCreate, current_user: dict = Depends(get_current_user)):
+    now = utcnow()
     event_doc = {
-        **event.dict(),
+        **event.model_dump(),
         "host_id": str(current_user["_id"]),
+        # GeoJSON copy of lat/lng so the 2dsphere index can drive radius search
+        "location": {
+            "type": "Point",
+            "coordinates": [event.longitude, event.latitude]
+        },
         "attendees": [],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "attendees_count": 0,
+        "created_at": now,
+        "updated_at": now
     }
     
     result = await db.events.insert_one(event_doc)
     event_doc["_id"] = result.inserted_id
     
-    host_dict = await user_to_dict(current_user)
+    host_dict = user_to_dict(current_user)
     return EventResponse(
         id=str(event_doc["_id"]),
-        **event.dict(),
+        **event.model_dump(),
         host=host_dict,
         attendees_count=0,
         is_attending=False,
         created_at=event_doc["created_at"]
     )
 
-@api_router.get("/events", response_model=List[EventResponse])
+@api_router.get("/events")
 async def get_events(
     latitude: Optional[float] = None,
     longitude: Optional[float] = None,
@@ -561,6 +1098,7 @@ async def get_events(
     category: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
 ):
     query = {}
@@ -577,21 +1115,57 @@ async def get_events(
         else:
             query["start_date"] = {"$lte": end_date}
     
-    events = await db.events.find(query).sort("start_date", 1).to_list(1000)
-    
+    user_id = str(current_user["_id"])
+
+    # Resolve attendance and counts inside Mongo and drop the attendees
+    # array from the wire — it grows with every RSVP and the list view only
+    # needs a count plus the viewer's own membership
+    membership_stages = [
+        {"$addFields": {
+            "attendees_count": {"$ifNull": [
+                "$attendees_count", {"$size": {"$ifNull": ["$attendees", []]}}
+            ]},
+            "is_attending": {"$in": [user_id, {"$ifNull": ["$attendees", []]}]}
+        }},
+        {"$project": {"attendees": 0}},
+        {"$sort": {"start_date": 1}},
+        {"$limit": limit}
+    ]
+
+    if latitude is not None and longitude is not None:
+        # Index-backed radius filter: Mongo only returns events inside the
+        # radius instead of shipping every event over for a Python Haversine
+        # scan. Requires the GeoJSON location field written on create_event.
+        pipeline = [{"$geoNear": {
+            "near": {"type": "Point", "coordinates": [longitude, latitude]},
+            "distanceField": "distance",
+            "maxDistance": radius * 1000,  # km -> meters
+            "spherical": True,
+            "query": query
+        }}] + membership_stages
+    else:
+        pipeline = [{"$match": query}] + membership_stages
+
+    events_cursor = await db.events.aggregate(pipeline)
+    events = await events_cursor.to_list(limit)
+
+    # One $in fetch for every host on the page, instead of a users find_one
+    # per event
+    host_ids = list({event["host_id"] for event in events})
+    hosts = await db.users.find(
+        {"_id": {"$in": [ObjectId(hid) for hid in host_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(host_ids)) if host_ids else []
+    hosts_map = users_to_dict(hosts)
+
     result = []
     for event in events:
-        if latitude and longitude:
-            distance = calculate_distance(latitude, longitude, event["latitude"], event["longitude"])
-            if distance > radius:
-                continue
-        
-        host = await db.users.find_one({"_id": ObjectId(event["host_id"])})
-        host_dict = await user_to_dict(host) if host else {}
-        
-        is_attending = str(current_user["_id"]) in event.get("attendees", [])
-        
-        result.append(EventResponse(
+        host_dict = hosts_map.get(event["host_id"], {})
+        is_attending = event.get("is_attending", False)
+
+        # model_construct skips re-validating fields we just read from our
+        # own documents — measurable on list endpoints
+        result.append(EventResponse.model_construct(
             id=str(event["_id"]),
             title=event["title"],
             description=event["description"],
@@ -607,7 +1181,7 @@ async def get_events(
             requirements=event.get("requirements"),
             images=event.get("images", []),
             host=host_dict,
-            attendees_count=len(event.get("attendees", [])),
+            attendees_count=event.get("attendees_count", len(event.get("attendees", []))),
             is_attending=is_attending,
             created_at=event["created_at"]
         ))
@@ -615,17 +1189,11 @@ async def get_events(
     return result
 
 @api_router.get("/events/{event_id}", response_model=EventResponse)
-async def get_event(event_id: str, current_user: dict = Depends(get_current_user)):
-    try:
-        event = await db.events.find_one({"_id": ObjectId(event_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    host = await db.users.find_one({"_id": ObjectId(event["host_id"])})
-    host_dict = await user_to_dict(host) if host else {}
+async def get_event(event: dict = Depends(load_event), current_user: dict = Depends(get_current_user)):
+    host = await db.users.find_one(
+        {"_id": ObjectId(event["host_id"])}, projection=USER_SAFE_PROJECTION
+    )
+    host_dict = user_to_dict(host) if host else {}
     
     is_attending = str(current_user["_id"]) in event.get("attendees", [])
     
@@ -645,59 +1213,64 @@ async def get_event(event_id: str, current_user: dict = Depends(get_current_user
         requirements=event.get("requirements"),
         images=event.get("images", []),
         host=host_dict,
-        attendees_count=len(event.get("attendees", [])),
+        attendees_count=event.get("attendees_count", len(event.get("attendees", []))),
         is_attending=is_attending,
         created_at=event["created_at"]
     )
 
 @api_router.post("/events/{event_id}/rsvp")
-async def rsvp_event(event_id: str, current_user: dict = Depends(get_current_user)):
-    try:
-        event = await db.events.find_one({"_id": ObjectId(event_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
+async def rsvp_event(eid: ObjectId = Depends(event_object_id), current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
-    attendees = event.get("attendees", [])
-    
-    if user_id in attendees:
-        # Already attending, remove RSVP
-        await db.events.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$pull": {"attendees": user_id}}
-        )
+
+    # Toggle without the read-then-write race: each branch matches and
+    # mutates in one atomic update, so concurrent RSVPs can neither double
+    # count nor push an event past capacity
+    removed = await db.events.update_one(
+        {"_id": eid, "attendees": user_id},
+        {"$pull": {"attendees": user_id}, "$inc": {"attendees_count": -1}}
+    )
+    if removed.modified_count:
         return {"message": "RSVP removed", "is_attending": False}
-    else:
-        # Check max participants
-        if event.get("max_participants") and len(attendees) >= event["max_participants"]:
-            raise HTTPException(status_code=400, detail="Event is full")
-        
-        # Add RSVP
-        await db.events.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$push": {"attendees": user_id}}
-        )
+
+    # Capacity is enforced inside the same filter: the $expr only matches
+    # while the attendee list is below max_participants (or it is unset)
+    added = await db.events.update_one(
+        {
+            "_id": eid,
+            "attendees": {"$ne": user_id},
+            "$expr": {"$or": [
+                {"$eq": [{"$ifNull": ["$max_participants", None]}, None]},
+                {"$lt": [{"$size": {"$ifNull": ["$attendees", []]}}, "$max_participants"]}
+            ]}
+        },
+        {"$push": {"attendees": user_id}, "$inc": {"attendees_count": 1}}
+    )
+    if added.modified_count:
         return {"message": "RSVP confirmed", "is_attending": True}
 
-@api_router.get("/events/{event_id}/attendees")
-async def get_event_attendees(event_id: str, current_user: dict = Depends(get_current_user)):
-    try:
-        event = await db.events.find_one({"_id": ObjectId(event_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
+    # Neither write matched — missing event, a concurrent duplicate RSVP,
+    # or genuinely full; one probe with a membership slice tells them apart
+    event = await db.events.find_one(
+        {"_id": eid},
+        projection={"attendees": {"$elemMatch": {"$eq": user_id}}}
+    )
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    attendees = []
-    for user_id in event.get("attendees", []):
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if user:
-            attendees.append(await user_to_dict(user))
-    
+    if event.get("attendees"):
+        # A concurrent request already confirmed this RSVP
+        return {"message": "RSVP confirmed", "is_attending": True}
+    raise HTTPException(status_code=400, detail="Event is full")
+
+@api_router.get("/events/{event_id}/attendees")
+async def get_event_attendees(event: dict = Depends(load_event), current_user: dict = Depends(get_current_user)):
+    attendee_ids = event.get("attendees", [])
+    users = await db.users.find(
+        {"_id": {"$in": [ObjectId(uid) for uid in attendee_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(attendee_ids)) if attendee_ids else []
+    users_map = users_to_dict(users)
+
+    attendees = [users_map[uid] for uid in attendee_ids if uid in users_map]
     return {"attendees": attendees}
 
 # ============= POST ROUTES =============
@@ -708,11 +1281,14 @@ async def create_post(post: PostCreate, current_user: dict = Depends(get_current
         "content": post.content,
         "images": post.images,
         "likes": [],
-        "created_at": datetime.now(timezone.utc)
+        "likes_count": 0,
+        "comments_count": 0,
+        "counters_backfilled": True,
+        "created_at": utcnow()
     }
     
     result = await db.posts.insert_one(post_doc)
-    user_dict = await user_to_dict(current_user)
+    user_dict = user_to_dict(current_user)
     
     return PostResponse(
         id=str(result.inserted_id),
@@ -725,16 +1301,17 @@ async def create_post(post: PostCreate, current_user: dict = Depends(get_current
         created_at=post_doc["created_at"]
     )
 
-@api_router.get("/posts", response_model=PaginatedPostsResponse)
+@api_router.get("/posts")
 async def get_feed(
     cursor: Optional[str] = None,
-    limit: int = Query(default=20, le=50),
+    limit: int = Query(default=20, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
 ):
-    # Get posts from followed users + own posts
-    following = await db.follows.find({"follower_id": str(current_user["_id"])}).to_list(1000)
-    following_ids = [f["following_id"] for f in following]
-    following_ids.append(str(current_user["_id"]))
+    user_id = str(current_user["_id"])
+
+    # Get posts from followed users + own posts, via the cached following set
+    following_ids = await get_following_ids(user_id)
+    following_ids = following_ids + [user_id]
 
     query = {"user_id": {"$in": following_ids}}
 
@@ -749,10 +1326,24 @@ async def get_feed(
         except Exception:
             pass  # Invalid cursor, ignore
 
-    posts = await db.posts.find(query).sort([
-        ("created_at", -1),
-        ("_id", -1)
-    ]).limit(limit + 1).to_list(limit + 1)
+    # One pipeline returns the whole page: the viewer's like membership is
+    # resolved with $in before the array is dropped, and authors are joined
+    # via $lookup (trimmed to PUBLIC_USER_FIELDS) — no follow-up user fetch.
+    # Like and comment counts are denormalized counters maintained on write.
+    posts_cursor = await db.posts.aggregate([
+        {"$match": query},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$addFields": {
+            "is_liked": {"$in": [user_id, {"$ifNull": ["$likes", []]}]},
+            "author_oid": {"$toObjectId": "$user_id"}
+        }},
+        {"$lookup": {"from": "users", "localField": "author_oid", "foreignField": "_id", "as": "author",
+                     "pipeline": [{"$project": PUBLIC_USER_FIELDS}]}},
+        {"$unwind": "$author"},
+        {"$project": {"likes": 0, "author_oid": 0}}
+    ])
+    posts = await posts_cursor.to_list(limit + 1)
 
     has_more = len(posts) > limit
     if has_more:
@@ -760,22 +1351,16 @@ async def get_feed(
 
     result = []
     for post in posts:
-        user = await db.users.find_one({"_id": ObjectId(post["user_id"])})
-        if not user:
-            continue
+        user_dict = user_to_dict(post["author"])
 
-        user_dict = await user_to_dict(user)
-        comments_count = await db.comments.count_documents({"post_id": str(post["_id"])})
-        is_liked = str(current_user["_id"]) in post.get("likes", [])
-
-        result.append(PostResponse(
+        result.append(PostResponse.model_construct(
             id=str(post["_id"]),
             user=user_dict,
             content=post["content"],
             images=post.get("images", []),
-            likes_count=len(post.get("likes", [])),
-            comments_count=comments_count,
-            is_liked=is_liked,
+            likes_count=post.get("likes_count", 0),
+            comments_count=post.get("comments_count", 0),
+            is_liked=post.get("is_liked", False),
             created_at=post["created_at"]
         ))
 
@@ -784,7 +1369,9 @@ async def get_feed(
         last = posts[-1]
         next_cursor = encode_cursor(last["created_at"], str(last["_id"]))
 
-    return PaginatedPostsResponse(
+    # Built from model_construct parts, so returning the model directly
+    # (no response_model) skips FastAPI's output re-validation pass.
+    return PaginatedPostsResponse.model_construct(
         posts=result,
         next_cursor=next_cursor,
         has_more=has_more
@@ -792,43 +1379,60 @@ async def get_feed(
 
 @api_router.post("/posts/{post_id}/like")
 async def like_post(post_id: str, current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
     try:
-        post = await db.posts.find_one({"_id": ObjectId(post_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
-    if not post:
+        pid = ObjectId(post_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="Post not found")
-    
-    user_id = str(current_user["_id"])
-    likes = post.get("likes", [])
-    
-    if user_id in likes:
-        await db.posts.update_one({"_id": ObjectId(post_id)}, {"$pull": {"likes": user_id}})
+
+    # Atomic toggle, same shape as rsvp_event: the membership condition
+    # lives in the update filter, so read-then-write races between
+    # concurrent likes cannot double-count
+    unliked = await db.posts.update_one(
+        {"_id": pid, "likes": user_id},
+        {"$pull": {"likes": user_id}, "$inc": {"likes_count": -1}}
+    )
+    if unliked.modified_count:
         return {"message": "Like removed", "is_liked": False}
-    else:
-        await db.posts.update_one({"_id": ObjectId(post_id)}, {"$push": {"likes": user_id}})
+
+    liked = await db.posts.update_one(
+        {"_id": pid, "likes": {"$ne": user_id}},
+        {"$addToSet": {"likes": user_id}, "$inc": {"likes_count": 1}}
+    )
+    if liked.matched_count:
         return {"message": "Post liked", "is_liked": True}
 
+    # Neither filter matched: either the post is gone, or a concurrent
+    # request from the same user liked it between the two updates — probe
+    # to tell them apart before claiming 404
+    post = await db.posts.find_one({"_id": pid}, projection={"_id": 1})
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    # The concurrent request already recorded the like (and its count)
+    return {"message": "Post liked", "is_liked": True}
+
 @api_router.post("/posts/{post_id}/comments", response_model=CommentResponse)
 async def create_comment(post_id: str, comment: CommentCreate, current_user: dict = Depends(get_current_user)):
     try:
-        post = await db.posts.find_one({"_id": ObjectId(post_id)})
-    except:
+        pid = ObjectId(post_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="Post not found")
-    
+
+    post = await db.posts.find_one({"_id": pid}, projection={"_id": 1})
+
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    
+
     comment_doc = {
         "post_id": post_id,
         "user_id": str(current_user["_id"]),
         "content": comment.content,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": utcnow()
     }
-    
+
     result = await db.comments.insert_one(comment_doc)
-    user_dict = await user_to_dict(current_user)
+    await db.posts.update_one({"_id": pid}, {"$inc": {"comments_count": 1}})
+    user_dict = user_to_dict(current_user)
     
     return CommentResponse(
         id=str(result.inserted_id),
@@ -838,17 +1442,33 @@ async def create_comment(post_id: str, comment: CommentCreate, current_user: dic
     )
 
 @api_router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
-async def get_comments(post_id: str, current_user: dict = Depends(get_current_user)):
-    comments = await db.comments.find({"post_id": post_id}).sort("created_at", 1).to_list(1000)
-    
+async def get_comments(
+    post_id: str,
+    after: Optional[datetime] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    # Oldest-first paging: pass the last comment's created_at back as
+    # `after` to fetch the next page
+    query = {"post_id": post_id}
+    if after:
+        query["created_at"] = {"$gt": after}
+    comments = await db.comments.find(query).sort("created_at", 1).limit(limit).to_list(limit)
+
+    author_ids = list({comment["user_id"] for comment in comments})
+    authors = await db.users.find(
+        {"_id": {"$in": [ObjectId(uid) for uid in author_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(author_ids)) if author_ids else []
+    authors_map = users_to_dict(authors)
+
     result = []
     for comment in comments:
-        user = await db.users.find_one({"_id": ObjectId(comment["user_id"])})
-        if not user:
+        user_dict = authors_map.get(comment["user_id"])
+        if not user_dict:
             continue
-        
-        user_dict = await user_to_dict(user)
-        result.append(CommentResponse(
+
+        result.append(CommentResponse.model_construct(
             id=str(comment["_id"]),
             user=user_dict,
             content=comment["content"],
@@ -860,64 +1480,119 @@ async def get_comments(post_id: str, current_user: dict = Depends(get_current_us
 # ============= SOCIAL ROUTES =============
 @api_router.post("/users/{user_id}/follow")
 async def follow_user(user_id: str, current_user: dict = Depends(get_current_user)):
-    if user_id == str(current_user["_id"]):
+    follower_id = str(current_user["_id"])
+    if user_id == follower_id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
     
     try:
-        target_user = await db.users.find_one({"_id": ObjectId(user_id)})
-    except:
+        target_oid = ObjectId(user_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="User not found")
+
+    target_user = await db.users.find_one({"_id": target_oid}, projection={"_id": 1})
     
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    existing = await db.follows.find_one({
-        "follower_id": str(current_user["_id"]),
+    # Toggle in one write: a delete that matches means we were following;
+    # otherwise insert the edge, with the unique index turning a concurrent
+    # double-follow into a DuplicateKeyError no-op
+    deleted = await db.follows.delete_one({
+        "follower_id": follower_id,
         "following_id": user_id
     })
-    
-    if existing:
-        await db.follows.delete_one({"_id": existing["_id"]})
-        return {"message": "Unfollowed", "is_following": False}
+
+    if deleted.deleted_count:
+        delta = -1
+        response = {"message": "Unfollowed", "is_following": False}
     else:
-        await db.follows.insert_one({
-            "follower_id": str(current_user["_id"]),
-            "following_id": user_id,
-            "created_at": datetime.now(timezone.utc)
-        })
-        return {"message": "Following", "is_following": True}
+        try:
+            await db.follows.insert_one({
+                "follower_id": follower_id,
+                "following_id": user_id,
+                "created_at": utcnow()
+            })
+        except DuplicateKeyError:
+            return {"message": "Following", "is_following": True}
+        delta = 1
+        response = {"message": "Following", "is_following": True}
+
+    # Keep the denormalized counters in step with the follow edge
+    await db.users.bulk_write([
+        UpdateOne({"_id": target_oid}, {"$inc": {"followers_count": delta}}),
+        UpdateOne({"_id": current_user["_id"]}, {"$inc": {"following_count": delta}})
+    ])
+    invalidate_user_cache(user_id)
+    invalidate_user_cache(follower_id)
+    following_cache.pop(follower_id, None)
+
+    return response
 
 @api_router.get("/users/{user_id}/followers")
-async def get_followers(user_id: str, current_user: dict = Depends(get_current_user)):
-    follows = await db.follows.find({"following_id": user_id}).to_list(1000)
-    
-    followers = []
-    for follow in follows:
-        user = await db.users.find_one({"_id": ObjectId(follow["follower_id"])})
-        if user:
-            followers.append(await user_to_dict(user))
-    
-    return {"followers": followers}
+async def get_followers(
+    user_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    # Newest-first paging over the follow edge's _id; pass next_cursor back
+    # to fetch the next page
+    query = {"following_id": user_id}
+    if cursor:
+        try:
+            query["_id"] = {"$lt": ObjectId(cursor)}
+        except InvalidId:
+            pass  # Invalid cursor, ignore — same policy as the feed
+    follows = await db.follows.find(query).sort("_id", -1).limit(limit).to_list(limit)
+
+    follower_ids = [follow["follower_id"] for follow in follows]
+    users = await db.users.find(
+        {"_id": {"$in": [ObjectId(uid) for uid in follower_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(follower_ids)) if follower_ids else []
+    users_map = users_to_dict(users)
+    followers = [users_map[uid] for uid in follower_ids if uid in users_map]
+
+    next_cursor = str(follows[-1]["_id"]) if len(follows) == limit else None
+    return {"followers": followers, "next_cursor": next_cursor}
 
 @api_router.get("/users/{user_id}/following")
-async def get_following(user_id: str, current_user: dict = Depends(get_current_user)):
-    follows = await db.follows.find({"follower_id": user_id}).to_list(1000)
-    
-    following = []
-    for follow in follows:
-        user = await db.users.find_one({"_id": ObjectId(follow["following_id"])})
-        if user:
-            following.append(await user_to_dict(user))
-    
-    return {"following": following}
+async def get_following(
+    user_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    query = {"follower_id": user_id}
+    if cursor:
+        try:
+            query["_id"] = {"$lt": ObjectId(cursor)}
+        except InvalidId:
+            pass  # Invalid cursor, ignore — same policy as the feed
+    follows = await db.follows.find(query).sort("_id", -1).limit(limit).to_list(limit)
+
+    following_ids = [follow["following_id"] for follow in follows]
+    users = await db.users.find(
+        {"_id": {"$in": [ObjectId(uid) for uid in following_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(following_ids)) if following_ids else []
+    users_map = users_to_dict(users)
+    following = [users_map[uid] for uid in following_ids if uid in users_map]
+
+    next_cursor = str(follows[-1]["_id"]) if len(follows) == limit else None
+    return {"following": following, "next_cursor": next_cursor}
 
 # ============= MESSAGE ROUTES =============
 @api_router.post("/messages", response_model=MessageResponse)
 async def send_message(message: MessageCreate, current_user: dict = Depends(get_current_user)):
     try:
-        receiver = await db.users.find_one({"_id": ObjectId(message.receiver_id)})
-    except:
+        receiver_oid = ObjectId(message.receiver_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="Receiver not found")
+
+    receiver = await db.users.find_one(
+        {"_id": receiver_oid}, projection=USER_SAFE_PROJECTION
+    )
     
     if not receiver:
         raise HTTPException(status_code=404, detail="Receiver not found")
@@ -927,13 +1602,13 @@ async def send_message(message: MessageCreate, current_user: dict = Depends(get_
         "receiver_id": message.receiver_id,
         "content": message.content,
         "read": False,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": utcnow()
     }
     
     result = await db.messages.insert_one(message_doc)
     
-    sender_dict = await user_to_dict(current_user)
-    receiver_dict = await user_to_dict(receiver)
+    sender_dict = user_to_dict(current_user)
+    receiver_dict = user_to_dict(receiver)
     
     return MessageResponse(
         id=str(result.inserted_id),
@@ -945,124 +1620,215 @@ async def send_message(message: MessageCreate, current_user: dict = Depends(get_
     )
 
 @api_router.get("/messages/conversations")
-async def get_conversations(current_user: dict = Depends(get_current_user)):
+async def get_conversations(
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = str(current_user["_id"])
-    
-    # Get all messages involving the user
-    messages = await db.messages.find({
-        "$or": [
+
+    # Group by partner and compute last message + unread count inside Mongo:
+    # one aggregation instead of pulling every message and looping in Python
+    grouped_cursor = await db.messages.aggregate([
+        {"$match": {"$or": [
             {"sender_id": user_id},
             {"receiver_id": user_id}
-        ]
-    }).sort("created_at", -1).to_list(1000)
-    
-    # Group by conversation partner
-    conversations = {}
-    for msg in messages:
-        partner_id = msg["receiver_id"] if msg["sender_id"] == user_id else msg["sender_id"]
-        
-        if partner_id not in conversations:
-            partner = await db.users.find_one({"_id": ObjectId(partner_id)})
-            if partner:
-                conversations[partner_id] = {
-                    "partner": await user_to_dict(partner),
-                    "last_message": msg["content"],
-                    "last_message_time": msg["created_at"],
-                    "unread_count": 0
-                }
-        
-        if msg["receiver_id"] == user_id and not msg["read"]:
-            conversations[partner_id]["unread_count"] += 1
-    
-    return {"conversations": list(conversations.values())}
+        ]}},
+        {"$sort": {"created_at": -1}},
+        {"$addFields": {"partner_id": {
+            "$cond": [{"$eq": ["$sender_id", user_id]}, "$receiver_id", "$sender_id"]
+        }}},
+        {"$group": {
+            "_id": "$partner_id",
+            "last_message": {"$first": "$content"},
+            "last_message_time": {"$first": "$created_at"},
+            "unread_count": {"$sum": {"$cond": [
+                {"$and": [
+                    {"$eq": ["$receiver_id", user_id]},
+                    {"$eq": ["$read", False]}
+                ]}, 1, 0
+            ]}}
+        }},
+        {"$sort": {"last_message_time": -1}},
+        {"$limit": limit}
+    ])
+    grouped = await grouped_cursor.to_list(limit)
+
+    partner_ids = [conv["_id"] for conv in grouped]
+    partners = await db.users.find(
+        {"_id": {"$in": [ObjectId(pid) for pid in partner_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(partner_ids)) if partner_ids else []
+    partners_map = users_to_dict(partners)
+
+    conversations = []
+    for conv in grouped:
+        partner = partners_map.get(conv["_id"])
+        if not partner:
+            continue
+        conversations.append({
+            "partner": partner,
+            "last_message": conv["last_message"],
+            "last_message_time": conv["last_message_time"],
+            "unread_count": conv["unread_count"]
+        })
+
+    return {"conversations": conversations}
 
 @api_router.get("/messages/{user_id}", response_model=List[MessageResponse])
-async def get_messages_with_user(user_id: str, current_user: dict = Depends(get_current_user)):
+async def get_messages_with_user(
+    user_id: str,
+    before: Optional[datetime] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
     current_user_id = str(current_user["_id"])
-    
-    messages = await db.messages.find({
-        "$or": [
-            {"sender_id": current_user_id, "receiver_id": user_id},
-            {"sender_id": user_id, "receiver_id": current_user_id}
-        ]
-    }).sort("created_at", 1).to_list(1000)
-    
-    # Mark messages as read
-    await db.messages.update_many(
-        {"sender_id": user_id, "receiver_id": current_user_id, "read": False},
-        {"$set": {"read": True}}
+
+    match = {"$or": [
+        {"sender_id": current_user_id, "receiver_id": user_id},
+        {"sender_id": user_id, "receiver_id": current_user_id}
+    ]}
+    if before:
+        match["created_at"] = {"$lt": before}
+
+    # Join sender/receiver inside Mongo — the old loop did two users
+    # find_one round-trips per message. Newest page first (pass the oldest
+    # created_at back as `before` to scroll up), flipped to chronological
+    # order below.
+    messages_cursor = await db.messages.aggregate([
+        {"$match": match},
+        {"$sort": {"created_at": -1}},
+        {"$limit": limit},
+        {"$addFields": {
+            "sender_oid": {"$toObjectId": "$sender_id"},
+            "receiver_oid": {"$toObjectId": "$receiver_id"}
+        }},
+        {"$lookup": {"from": "users", "localField": "sender_oid", "foreignField": "_id", "as": "sender",
+                     "pipeline": [{"$project": PUBLIC_USER_FIELDS}]}},
+        {"$lookup": {"from": "users", "localField": "receiver_oid", "foreignField": "_id", "as": "receiver",
+                     "pipeline": [{"$project": PUBLIC_USER_FIELDS}]}},
+        {"$unwind": "$sender"},
+        {"$unwind": "$receiver"}
+    ])
+
+    # Marking the thread read is independent of fetching it — overlap the
+    # write with the history round-trip
+    messages, _ = await asyncio.gather(
+        messages_cursor.to_list(limit),
+        db.messages.update_many(
+            {"sender_id": user_id, "receiver_id": current_user_id, "read": False},
+            {"$set": {"read": True}}
+        )
     )
-    
+    messages.reverse()
+
     result = []
     for msg in messages:
-        sender = await db.users.find_one({"_id": ObjectId(msg["sender_id"])})
-        receiver = await db.users.find_one({"_id": ObjectId(msg["receiver_id"])})
-        
-        if sender and receiver:
-            result.append(MessageResponse(
-                id=str(msg["_id"]),
-                sender=await user_to_dict(sender),
-                receiver=await user_to_dict(receiver),
-                content=msg["content"],
-                read=msg["read"],
-                created_at=msg["created_at"]
-            ))
-    
+        result.append(MessageResponse.model_construct(
+            id=str(msg["_id"]),
+            sender=user_to_dict(msg["sender"]),
+            receiver=user_to_dict(msg["receiver"]),
+            content=msg["content"],
+            read=msg["read"],
+            created_at=msg["created_at"]
+        ))
+
     return result
 
 # ============= EVENT CHAT ROUTES =============
 @api_router.post("/events/{event_id}/chat")
-async def send_event_chat_message(event_id: str, message: str, current_user: dict = Depends(get_current_user)):
-    try:
-        event = await db.events.find_one({"_id": ObjectId(event_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if user is attending or is the host
+async def send_event_chat_message(
+    event_id: str,
+    message: str,
+    event_oid: ObjectId = Depends(event_object_id),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = str(current_user["_id"])
-    if user_id not in event.get("attendees", []) and user_id != event["host_id"]:
+
+    # Evaluate the attending-or-host predicate inside the query: one
+    # _id-indexed, projection-only read instead of shipping the whole
+    # attendee array over just to check membership in Python
+    event = await db.events.find_one(
+        {"_id": event_oid, "$or": [{"attendees": user_id}, {"host_id": user_id}]},
+        projection={"_id": 1}
+    )
+    if not event:
+        # Rare failure path — tell a missing event apart from a non-attendee
+        exists = await db.events.find_one({"_id": event_oid}, projection={"_id": 1})
+        if not exists:
+            raise HTTPException(status_code=404, detail="Event not found")
         raise HTTPException(status_code=403, detail="Must be attending event to chat")
-    
+
     chat_msg = {
         "event_id": event_id,
         "user_id": user_id,
         "message": message,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": utcnow()
     }
     
-    await db.event_chats.insert_one(chat_msg)
+    await event_chats_w1.insert_one(chat_msg)
+    invalidate_event_chat_cache(event_id)
     return {"message": "Message sent"}
 
 @api_router.get("/events/{event_id}/chat")
-async def get_event_chat(event_id: str, current_user: dict = Depends(get_current_user)):
-    try:
-        event = await db.events.find_one({"_id": ObjectId(event_id)})
-    except:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
+async def get_event_chat(
+    event_id: str,
+    before: Optional[datetime] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    event_oid: ObjectId = Depends(event_object_id),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = str(current_user["_id"])
-    if user_id not in event.get("attendees", []) and user_id != event["host_id"]:
+    # Same query-side membership check as send_event_chat_message: one
+    # {_id: 1} probe instead of loading the event with its attendee array
+    event = await db.events.find_one(
+        {"_id": event_oid, "$or": [{"attendees": user_id}, {"host_id": user_id}]},
+        projection={"_id": 1}
+    )
+    if not event:
+        exists = await db.events.find_one({"_id": event_oid}, projection={"_id": 1})
+        if not exists:
+            raise HTTPException(status_code=404, detail="Event not found")
         raise HTTPException(status_code=403, detail="Must be attending event to view chat")
-    
-    messages = await db.event_chats.find({"event_id": event_id}).sort("created_at", 1).to_list(1000)
-    
+
+    # The latest page is the one every attendee polls — serve it from the
+    # short-TTL cache once the viewer's own membership check has passed.
+    # Scrollback pages (before set) are rarely re-fetched; skip the cache.
+    cache_key = (event_id, limit)
+    if before is None:
+        cached = event_chat_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Newest page first, flipped to chronological order for the response
+    chat_query = {"event_id": event_id}
+    if before:
+        chat_query["created_at"] = {"$lt": before}
+    messages = await db.event_chats.find(chat_query).sort("created_at", -1).limit(limit).to_list(limit)
+    messages.reverse()
+
+    # One $in fetch for every author on the page instead of a users
+    # find_one per message
+    author_ids = list({msg["user_id"] for msg in messages})
+    authors = await db.users.find(
+        {"_id": {"$in": [ObjectId(uid) for uid in author_ids]}},
+        projection=USER_SAFE_PROJECTION
+    ).to_list(len(author_ids)) if author_ids else []
+    authors_map = users_to_dict(authors)
+
     result = []
     for msg in messages:
-        user = await db.users.find_one({"_id": ObjectId(msg["user_id"])})
-        if user:
+        user_dict = authors_map.get(msg["user_id"])
+        if user_dict:
             result.append({
-                "user": await user_to_dict(user),
+                "user": user_dict,
                 "message": msg["message"],
                 "created_at": msg["created_at"]
             })
-    
-    return {"messages": result}
+
+    response = {"messages": result}
+    if before is None:
+        event_chat_cache[cache_key] = response
+    return response
 
 # ============= STORY ROUTES =============
 @api_router.post("/stories", response_model=StoryResponse)
@@ -1070,18 +1836,19 @@ async def create_story(
     story: StoryCreate,
     current_user: dict = Depends(get_current_user)
 ):
+    now = utcnow()
     story_doc = {
         "user_id": str(current_user["_id"]),
         "media_type": story.media_type,
         "media_url": story.media_url,
         "thumbnail_url": story.thumbnail_url,
         "views": [],
-        "created_at": datetime.now(timezone.utc),
-        "expires_at": datetime.now(timezone.utc) + timedelta(hours=24)
+        "created_at": now,
+        "expires_at": now + timedelta(hours=24)
     }
 
     result = await db.stories.insert_one(story_doc)
-    user_dict = await user_to_dict(current_user)
+    user_dict = user_to_dict(current_user)
 
     return StoryResponse(
         id=str(result.inserted_id),
@@ -1098,43 +1865,53 @@ async def create_story(
 @api_router.get("/stories/feed", response_model=List[UserStoriesResponse])
 async def get_stories_feed(current_user: dict = Depends(get_current_user)):
     """Get stories from followed users + own stories for the carousel"""
-    following = await db.follows.find({"follower_id": str(current_user["_id"])}).to_list(1000)
-    following_ids = [f["following_id"] for f in following]
-    following_ids.append(str(current_user["_id"]))
-
-    # Get active stories (not expired)
-    now = datetime.now(timezone.utc)
-    stories = await db.stories.find({
-        "user_id": {"$in": following_ids},
-        "expires_at": {"$gt": now}
-    }).sort("created_at", -1).to_list(1000)
-
-    # Group by user
-    user_stories_map = {}
-    for story in stories:
-        user_id = story["user_id"]
-        if user_id not in user_stories_map:
-            user_stories_map[user_id] = []
-        user_stories_map[user_id].append(story)
-
-    result = []
     current_user_id = str(current_user["_id"])
+    following_ids = await get_following_ids(current_user_id)
+    following_ids = following_ids + [current_user_id]
+
+    # One round trip: fetch active stories (TTL'd after 24h; the 500 cap
+    # bounds decode for any realistic carousel), group them per author in
+    # the engine, and join each author through a trimmed $lookup — no
+    # per-author find_one loop
+    grouped_cursor = await db.stories.aggregate([
+        {"$match": {
+            "user_id": {"$in": following_ids},
+            "expires_at": {"$gt": utcnow()}
+        }},
+        {"$sort": {"created_at": -1}},
+        {"$limit": 500},
+        {"$group": {"_id": "$user_id", "stories": {"$push": "$$ROOT"}}},
+        {"$addFields": {"user_oid": {"$toObjectId": "$_id"}}},
+        {"$lookup": {"from": "users", "localField": "user_oid", "foreignField": "_id", "as": "user",
+                     "pipeline": [{"$project": PUBLIC_USER_FIELDS}]}},
+        {"$unwind": "$user"},
+        # Carousel order (self first, unviewed next, then recency) computed
+        # and sorted engine-side so Python never touches timestamps
+        {"$addFields": {
+            "is_self": {"$eq": ["$_id", current_user_id]},
+            "has_unviewed": {"$anyElementTrue": {"$map": {
+                "input": "$stories",
+                "as": "s",
+                "in": {"$not": {"$in": [current_user_id, {"$ifNull": ["$$s.views", []]}]}}
+            }}},
+            "latest": {"$max": "$stories.created_at"}
+        }},
+        {"$sort": {"is_self": -1, "has_unviewed": -1, "latest": -1}},
+        {"$project": {"user_oid": 0, "is_self": 0, "latest": 0}}
+    ])
+    grouped = await grouped_cursor.to_list(500)
 
-    for user_id, user_story_list in user_stories_map.items():
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            continue
+    result = []
 
-        user_dict = await user_to_dict(user)
+    for row in grouped:
+        user_story_list = row["stories"]
+        user_dict = user_to_dict(row["user"])
         story_responses = []
-        has_unviewed = False
+        has_unviewed = row["has_unviewed"]
 
         for story in user_story_list:
             is_viewed = current_user_id in story.get("views", [])
-            if not is_viewed:
-                has_unviewed = True
-
-            story_responses.append(StoryResponse(
+            story_responses.append(StoryResponse.model_construct(
                 id=str(story["_id"]),
                 user=user_dict,
                 media_type=story["media_type"],
@@ -1146,19 +1923,12 @@ async def get_stories_feed(current_user: dict = Depends(get_current_user)):
                 expires_at=story["expires_at"]
             ))
 
-        result.append(UserStoriesResponse(
+        result.append(UserStoriesResponse.model_construct(
             user=user_dict,
             stories=story_responses,
             has_unviewed=has_unviewed
         ))
 
-    # Sort: own stories first, then unviewed, then by recency
-    result.sort(key=lambda x: (
-        x.user["id"] != current_user_id,  # Own stories first
-        not x.has_unviewed,  # Unviewed before viewed
-        -x.stories[0].created_at.timestamp() if x.stories else 0
-    ))
-
     return result
 
 @api_router.post("/stories/{story_id}/view")
@@ -1167,21 +1937,21 @@ async def mark_story_viewed(
     current_user: dict = Depends(get_current_user)
 ):
     """Mark a story as viewed by current user"""
+    user_id = str(current_user["_id"])
     try:
-        story = await db.stories.find_one({"_id": ObjectId(story_id)})
-    except:
+        sid = ObjectId(story_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    if not story:
+    # $addToSet no-ops when the viewer is already recorded, so one atomic
+    # round trip replaces the probe-then-push pair (and its re-view race)
+    res = await db.stories.update_one(
+        {"_id": sid},
+        {"$addToSet": {"views": user_id}}
+    )
+    if res.matched_count == 0:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    user_id = str(current_user["_id"])
-    if user_id not in story.get("views", []):
-        await db.stories.update_one(
-            {"_id": ObjectId(story_id)},
-            {"$push": {"views": user_id}}
-        )
-
     return {"message": "Story marked as viewed"}
 
 @api_router.delete("/stories/{story_id}")
@@ -1191,17 +1961,19 @@ async def delete_story(
 ):
     """Delete own story"""
     try:
-        story = await db.stories.find_one({"_id": ObjectId(story_id)})
-    except:
+        sid = ObjectId(story_id)
+    except InvalidId:
         raise HTTPException(status_code=404, detail="Story not found")
 
+    story = await db.stories.find_one({"_id": sid}, projection={"user_id": 1})
+
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
     if story["user_id"] != str(current_user["_id"]):
         raise HTTPException(status_code=403, detail="Cannot delete other user's story")
 
-    await db.stories.delete_one({"_id": ObjectId(story_id)})
+    await db.stories.delete_one({"_id": sid})
     return {"message": "Story deleted"}
 
 # ============= LOCATION ROUTES =============
@@ -1224,7 +1996,7 @@ async def update_location(
                 "type": "Point",
                 "coordinates": [location.longitude, location.latitude]  # GeoJSON order: [lng, lat]
             },
-            "location_updated_at": datetime.now(timezone.utc)
+            "location_updated_at": utcnow()
         }}
     )
 
@@ -1246,6 +2018,7 @@ async def toggle_location_sharing(
         {"_id": current_user["_id"]},
         {"$set": update_data}
     )
+    invalidate_user_cache(str(current_user["_id"]))
 
     return {"message": f"Location sharing {'enabled' if enabled else 'disabled'}"}
 
@@ -1253,8 +2026,8 @@ async def toggle_location_sharing(
 async def get_nearby_users(
     latitude: float = Query(...),
     longitude: float = Query(...),
-    radius_km: float = Query(default=10, le=50),
-    limit: int = Query(default=50, le=100),
+    radius_km: float = Query(default=10, gt=0, le=50),
+    limit: int = Query(default=50, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
 ):
     """Get users within specified radius who have opted-in to location sharing"""
@@ -1291,12 +2064,13 @@ async def get_nearby_users(
         }
     ]
 
-    users = await db.users.aggregate(pipeline).to_list(limit)
+    users_cursor = await db.users.aggregate(pipeline)
+    users = await users_cursor.to_list(limit)
 
     result = []
     for user in users:
         coords = user.get("location", {}).get("coordinates", [0, 0])
-        result.append(NearbyUserResponse(
+        result.append(NearbyUserResponse.model_construct(
             id=str(user["_id"]),
             name=user["name"],
             avatar=user.get("avatar"),
@@ -1313,32 +2087,101 @@ async def get_nearby_users(
 # ============= SEARCH ROUTES =============
 @api_router.get("/search")
 async def search(q: str, type: str = "all", current_user: dict = Depends(get_current_user)):
+    # Empty or one-character queries would match effectively everything —
+    # answer them without touching the database (or the cache)
+    q = q.strip()
+    if len(q) < 2:
+        empty = {}
+        if type in ["all", "users"]:
+            empty["users"] = []
+        if type in ["all", "events"]:
+            empty["events"] = []
+        return empty
+
+    cache_key = (q, type)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     results = {}
-    
-    if type in ["all", "users"]:
-        users = await db.users.find({
+
+    # $text rides the text indexes created at startup and ranks by
+    # relevance; the old unanchored case-insensitive $regex forced a full
+    # collection scan per search. Queries with explicit wildcards keep the
+    # regex path, since $text matches whole words only.
+    use_text = not any(ch in q for ch in "*?")
+
+    if use_text:
+        user_cursor = db.users.find(
+            {"$text": {"$search": q}},
+            projection={**USER_SAFE_PROJECTION, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})])
+        event_match = {"$text": {"$search": q}}
+        event_head = [
+            {"$match": event_match},
+            {"$sort": {"score": {"$meta": "textScore"}}},
+        ]
+    else:
+        # Anchored case-sensitive prefix over the lowercase copies: the
+        # name_lc/email_lc indexes turn this into a range scan, where the
+        # old /q/i regex had to look at every document
+        prefix = re.escape(q.rstrip("*?").lower())
+        user_cursor = db.users.find({
             "$or": [
-                {"name": {"$regex": q, "$options": "i"}},
-                {"email": {"$regex": q, "$options": "i"}}
+                {"name_lc": {"$regex": f"^{prefix}"}},
+                {"email_lc": {"$regex": f"^{prefix}"}}
             ]
-        }).limit(20).to_list(1000)
-        
-        results["users"] = [await user_to_dict(u) for u in users]
-    
-    if type in ["all", "events"]:
-        events = await db.events.find({
+        }, projection=USER_SAFE_PROJECTION)
+        event_head = [{"$match": {
             "$or": [
                 {"title": {"$regex": q, "$options": "i"}},
                 {"description": {"$regex": q, "$options": "i"}},
                 {"category": {"$regex": q, "$options": "i"}}
             ]
-        }).limit(20).to_list(1000)
+        }}]
+
+    # Count attendees inside Mongo and drop the array before it leaves the
+    # server — popular events would otherwise ship thousands of ids per hit
+    # just so Python can call len() on them
+    # $limit before the join so only the 20 page hits drive the $lookup;
+    # the host comes back joined, trimmed, and unwound in the same trip
+    event_pipeline = event_head + [
+        {"$limit": 20},
+        {"$addFields": {
+            "attendees_count": {"$ifNull": [
+                "$attendees_count", {"$size": {"$ifNull": ["$attendees", []]}}
+            ]},
+            "host_oid": {"$toObjectId": "$host_id"}
+        }},
+        {"$lookup": {"from": "users", "localField": "host_oid", "foreignField": "_id", "as": "host",
+                     "pipeline": [{"$project": PUBLIC_USER_FIELDS}]}},
+        {"$unwind": {"path": "$host", "preserveNullAndEmptyArrays": True}},
+        {"$project": {"attendees": 0, "host_oid": 0}},
+    ]
+
+    async def _event_search():
+        cursor = await db.events.aggregate(event_pipeline)
+        return await cursor.to_list(20)
+
+    # The user and event searches are independent — run them concurrently
+    # for type=all so the wall time is the slower of the two, not the sum
+    user_future = user_cursor.limit(20).to_list(20) if type in ["all", "users"] else None
+    event_future = _event_search() if type in ["all", "events"] else None
+
+    users, events = await asyncio.gather(
+        user_future if user_future is not None else asyncio.sleep(0),
+        event_future if event_future is not None else asyncio.sleep(0),
+    )
+
+    if user_future is not None:
+        results["users"] = [user_to_dict(u) for u in users]
+
+    if event_future is not None:
         
         event_results = []
         for event in events:
-            host = await db.users.find_one({"_id": ObjectId(event["host_id"])})
-            host_dict = await user_to_dict(host) if host else {}
-            
+            host_dict = user_to_dict(event["host"]) if event.get("host") else {}
+
             event_results.append({
                 "id": str(event["_id"]),
                 "title": event["title"],
@@ -1346,11 +2189,12 @@ async def search(q: str, type: str = "all", current_user: dict = Depends(get_cur
                 "location_name": event["location_name"],
                 "start_date": event["start_date"],
                 "host": host_dict,
-                "attendees_count": len(event.get("attendees", []))
+                "attendees_count": event.get("attendees_count", 0)
             })
         
         results["events"] = event_results
-    
+
+    search_cache[cache_key] = results
     return results
 
 # ============= ROOT =============
@@ -1358,16 +2202,24 @@ async def search(q: str, type: str = "all", current_user: dict = Depends(get_cur
 async def root():
     return {"message": "Medious API - Social Event Platform"}
 
-app.include_router(api_router)
+# Pinned origin list instead of "*": wildcard + credentials is invalid per
+# the CORS spec, and an explicit list lets the middleware answer preflights
+# from precomputed headers. max_age lets browsers cache the preflight for a
+# day, dropping most OPTIONS traffic. Registered before the router so the
+# app definition reads middleware-first, top to bottom.
+cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8081").split(",")
 
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_origins,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+app.include_router(api_router)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -1376,11 +2228,20 @@ logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
     import uvicorn
+    # reload=True was hardcoded: the filesystem watcher and single worker
+    # belong to development only. ENV=dev restores that behavior; the
+    # default is a production runner — one worker per CPU (capped at 8)
+    # and no per-request access-log formatting.
+    dev = os.getenv("ENV", "production") == "dev"
     logger.info("Starting Medious API server...")
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        reload=dev,
+        workers=1 if dev else min(os.cpu_count() or 1, 8),
+        loop="uvloop",       # libuv event loop: ~2x loop throughput vs asyncio default
+        http="httptools",    # C HTTP parser instead of h11
+        log_level="info",
+        access_log=dev,
     )
@@ -5,8 +5,10 @@ Tests all authentication endpoints and flows
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import json
-import time
 from datetime import datetime, timedelta
 import uuid
 
@@ -14,15 +16,63 @@ import uuid
 BACKEND_URL = "https://ee6ed8aae057.ngrok-free.app/api"
 
 class MediousAuthTester:
+    # (connect, read) per endpoint class: register/login pay a server-side
+    # password hash, so they get read headroom; everything else should
+    # answer fast or is broken
+    TIMEOUTS = {
+        "register": (2, 15),
+        "login": (2, 10),
+        "default": (2, 5),
+    }
+
     def __init__(self):
         self.base_url = BACKEND_URL
+        # One session for the whole run: keep-alive amortizes the TLS
+        # handshake across tests, and the adapter retries transient 5xx
+        # from the preview proxy
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # 429 included so rate-limit pushback paces the suite (urllib3
+            # honors Retry-After) — replaces the old fixed 0.5s sleep.
+            # POST/PUT are opted in (urllib3 excludes them by default) so a
+            # cold-start 502 from the preview proxy retries on the pooled
+            # connection instead of failing the whole suite; these payloads
+            # are safe to replay against a 502 that never reached the app
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=2,
+                status=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST", "PUT"]),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": "medious-tester/1.0"})
         self.test_results = []
+        # Line-buffered JSONL mirror of every result: a crash mid-suite
+        # still leaves everything up to that point on disk
+        self._results_fp = open("/app/backend_test_results.jsonl", "w", buffering=1)
         self.test_user_email = f"test_{uuid.uuid4().hex[:8]}@example.com"
         self.test_user_password = "TestPassword123!"
         self.test_user_name = "Test User"
         self.auth_token = None
         self.reset_token = None
         
+    def _timeout(self, key="default"):
+        return self.TIMEOUTS.get(key, self.TIMEOUTS["default"])
+
+    @staticmethod
+    def _body_preview(response, max_bytes=512):
+        """Bounded decode of a response body for failure details — error pages
+        from the proxy can be kilobytes of HTML we'd otherwise fully decode
+        and store."""
+        return response.content[:max_bytes].decode("utf-8", "replace")
+
     def log_result(self, test_name, success, message, details=None):
         """Log test result"""
         result = {
@@ -33,7 +83,11 @@ class MediousAuthTester:
             "details": details
         }
         self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
+        self._results_fp.write(json.dumps(result, separators=(",", ":")) + "\n")
+        if success is None:
+            status = "⏭️ SKIP"
+        else:
+            status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {test_name}: {message}")
         if details and not success:
             print(f"   Details: {details}")
@@ -41,7 +95,7 @@ class MediousAuthTester:
     def test_api_health(self):
         """Test if API is accessible"""
         try:
-            response = requests.get(f"{self.base_url}/", timeout=10)
+            response = self.session.get(f"{self.base_url}/", timeout=self._timeout())
             if response.status_code == 200:
                 self.log_result("API Health Check", True, "API is accessible")
                 return True
@@ -61,19 +115,22 @@ class MediousAuthTester:
                 "name": self.test_user_name
             }
             
-            response = requests.post(f"{self.base_url}/auth/register", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/register", json=payload, timeout=self._timeout("register"))
             
             if response.status_code == 200:
                 data = response.json()
                 if "token" in data and "user" in data:
                     self.auth_token = data["token"]
+                    # Default header on the session: authenticated tests stop
+                    # rebuilding the dict per call
+                    self.session.headers["Authorization"] = f"Bearer {self.auth_token}"
                     self.log_result("User Registration (Valid)", True, "User registered successfully")
                     return True
                 else:
                     self.log_result("User Registration (Valid)", False, "Missing token or user in response", data)
                     return False
             else:
-                self.log_result("User Registration (Valid)", False, f"Registration failed with status {response.status_code}", response.text)
+                self.log_result("User Registration (Valid)", False, f"Registration failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("User Registration (Valid)", False, f"Registration request failed: {str(e)}")
@@ -88,13 +145,13 @@ class MediousAuthTester:
                 "name": "Another User"
             }
             
-            response = requests.post(f"{self.base_url}/auth/register", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/register", json=payload, timeout=self._timeout("register"))
             
             if response.status_code == 400:
                 self.log_result("User Registration (Duplicate)", True, "Duplicate email correctly rejected")
                 return True
             else:
-                self.log_result("User Registration (Duplicate)", False, f"Expected 400, got {response.status_code}", response.text)
+                self.log_result("User Registration (Duplicate)", False, f"Expected 400, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("User Registration (Duplicate)", False, f"Duplicate registration test failed: {str(e)}")
@@ -108,19 +165,20 @@ class MediousAuthTester:
                 "password": self.test_user_password
             }
             
-            response = requests.post(f"{self.base_url}/auth/login", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/login", json=payload, timeout=self._timeout("login"))
             
             if response.status_code == 200:
                 data = response.json()
                 if "token" in data and "user" in data:
                     self.auth_token = data["token"]  # Update token
+                    self.session.headers["Authorization"] = f"Bearer {self.auth_token}"
                     self.log_result("User Login (Valid)", True, "Login successful")
                     return True
                 else:
                     self.log_result("User Login (Valid)", False, "Missing token or user in response", data)
                     return False
             else:
-                self.log_result("User Login (Valid)", False, f"Login failed with status {response.status_code}", response.text)
+                self.log_result("User Login (Valid)", False, f"Login failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("User Login (Valid)", False, f"Login request failed: {str(e)}")
@@ -134,13 +192,13 @@ class MediousAuthTester:
                 "password": "WrongPassword123!"
             }
             
-            response = requests.post(f"{self.base_url}/auth/login", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/login", json=payload, timeout=self._timeout("login"))
             
             if response.status_code == 401:
                 self.log_result("User Login (Invalid Password)", True, "Invalid password correctly rejected")
                 return True
             else:
-                self.log_result("User Login (Invalid Password)", False, f"Expected 401, got {response.status_code}", response.text)
+                self.log_result("User Login (Invalid Password)", False, f"Expected 401, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("User Login (Invalid Password)", False, f"Invalid password test failed: {str(e)}")
@@ -154,13 +212,13 @@ class MediousAuthTester:
                 "password": "SomePassword123!"
             }
             
-            response = requests.post(f"{self.base_url}/auth/login", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/login", json=payload, timeout=self._timeout("login"))
             
             if response.status_code == 401:
                 self.log_result("User Login (Non-existent Email)", True, "Non-existent email correctly rejected")
                 return True
             else:
-                self.log_result("User Login (Non-existent Email)", False, f"Expected 401, got {response.status_code}", response.text)
+                self.log_result("User Login (Non-existent Email)", False, f"Expected 401, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("User Login (Non-existent Email)", False, f"Non-existent email test failed: {str(e)}")
@@ -173,8 +231,7 @@ class MediousAuthTester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.get(f"{self.base_url}/auth/verify", headers=headers, timeout=10)
+            response = self.session.get(f"{self.base_url}/auth/verify", timeout=self._timeout())
             
             if response.status_code == 200:
                 data = response.json()
@@ -185,7 +242,7 @@ class MediousAuthTester:
                     self.log_result("Token Verification (Valid)", False, "Token verification returned wrong user", data)
                     return False
             else:
-                self.log_result("Token Verification (Valid)", False, f"Token verification failed with status {response.status_code}", response.text)
+                self.log_result("Token Verification (Valid)", False, f"Token verification failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Token Verification (Valid)", False, f"Token verification request failed: {str(e)}")
@@ -195,13 +252,13 @@ class MediousAuthTester:
         """Test token verification with invalid token (should fail)"""
         try:
             headers = {"Authorization": "Bearer invalid_token_12345"}
-            response = requests.get(f"{self.base_url}/auth/verify", headers=headers, timeout=10)
+            response = self.session.get(f"{self.base_url}/auth/verify", headers=headers, timeout=self._timeout())
             
             if response.status_code == 401:
                 self.log_result("Token Verification (Invalid)", True, "Invalid token correctly rejected")
                 return True
             else:
-                self.log_result("Token Verification (Invalid)", False, f"Expected 401, got {response.status_code}", response.text)
+                self.log_result("Token Verification (Invalid)", False, f"Expected 401, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Token Verification (Invalid)", False, f"Invalid token test failed: {str(e)}")
@@ -211,13 +268,13 @@ class MediousAuthTester:
         """Test forgot password with existing email"""
         try:
             payload = {"email": self.test_user_email}
-            response = requests.post(f"{self.base_url}/auth/forgot-password", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/forgot-password", json=payload, timeout=self._timeout())
             
             if response.status_code == 200:
                 self.log_result("Forgot Password (Existing Email)", True, "Forgot password request processed")
                 return True
             else:
-                self.log_result("Forgot Password (Existing Email)", False, f"Forgot password failed with status {response.status_code}", response.text)
+                self.log_result("Forgot Password (Existing Email)", False, f"Forgot password failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Forgot Password (Existing Email)", False, f"Forgot password request failed: {str(e)}")
@@ -227,13 +284,13 @@ class MediousAuthTester:
         """Test forgot password with non-existent email"""
         try:
             payload = {"email": f"nonexistent_{uuid.uuid4().hex[:8]}@example.com"}
-            response = requests.post(f"{self.base_url}/auth/forgot-password", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/forgot-password", json=payload, timeout=self._timeout())
             
             if response.status_code == 200:
                 self.log_result("Forgot Password (Non-existent Email)", True, "Non-existent email handled gracefully")
                 return True
             else:
-                self.log_result("Forgot Password (Non-existent Email)", False, f"Expected 200, got {response.status_code}", response.text)
+                self.log_result("Forgot Password (Non-existent Email)", False, f"Expected 200, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Forgot Password (Non-existent Email)", False, f"Non-existent email test failed: {str(e)}")
@@ -251,7 +308,7 @@ class MediousAuthTester:
                 "avatar": "https://example.com/avatar.jpg"
             }
             
-            response = requests.post(f"{self.base_url}/auth/supabase-sync", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/supabase-sync", json=payload, timeout=self._timeout())
             
             if response.status_code == 200:
                 data = response.json()
@@ -262,7 +319,7 @@ class MediousAuthTester:
                     self.log_result("Supabase OAuth Sync (New User)", False, "Missing token or user in response", data)
                     return False
             else:
-                self.log_result("Supabase OAuth Sync (New User)", False, f"OAuth sync failed with status {response.status_code}", response.text)
+                self.log_result("Supabase OAuth Sync (New User)", False, f"OAuth sync failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Supabase OAuth Sync (New User)", False, f"OAuth sync request failed: {str(e)}")
@@ -278,13 +335,13 @@ class MediousAuthTester:
                 "name": "OAuth Test User"
             }
             
-            response = requests.post(f"{self.base_url}/auth/supabase-sync", json=payload, timeout=10)
+            response = self.session.post(f"{self.base_url}/auth/supabase-sync", json=payload, timeout=self._timeout())
             
             if response.status_code == 400:
                 self.log_result("Supabase OAuth Sync (Existing Email)", True, "Existing email correctly rejected")
                 return True
             else:
-                self.log_result("Supabase OAuth Sync (Existing Email)", False, f"Expected 400, got {response.status_code}", response.text)
+                self.log_result("Supabase OAuth Sync (Existing Email)", False, f"Expected 400, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Supabase OAuth Sync (Existing Email)", False, f"Existing email test failed: {str(e)}")
@@ -297,8 +354,7 @@ class MediousAuthTester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.get(f"{self.base_url}/users/profile", headers=headers, timeout=10)
+            response = self.session.get(f"{self.base_url}/users/profile", timeout=self._timeout())
             
             if response.status_code == 200:
                 data = response.json()
@@ -309,7 +365,7 @@ class MediousAuthTester:
                     self.log_result("Get User Profile (Authenticated)", False, "Profile returned wrong user", data)
                     return False
             else:
-                self.log_result("Get User Profile (Authenticated)", False, f"Profile retrieval failed with status {response.status_code}", response.text)
+                self.log_result("Get User Profile (Authenticated)", False, f"Profile retrieval failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Get User Profile (Authenticated)", False, f"Profile retrieval request failed: {str(e)}")
@@ -318,13 +374,16 @@ class MediousAuthTester:
     def test_get_user_profile_unauthenticated(self):
         """Test getting user profile without authentication (should fail)"""
         try:
-            response = requests.get(f"{self.base_url}/users/profile", timeout=10)
+            # None strips the session's default Authorization header for this
+            # one call, keeping the request genuinely unauthenticated
+            response = self.session.get(f"{self.base_url}/users/profile",
+                                        headers={"Authorization": None}, timeout=self._timeout())
             
             if response.status_code == 403:
                 self.log_result("Get User Profile (Unauthenticated)", True, "Unauthenticated request correctly rejected")
                 return True
             else:
-                self.log_result("Get User Profile (Unauthenticated)", False, f"Expected 403, got {response.status_code}", response.text)
+                self.log_result("Get User Profile (Unauthenticated)", False, f"Expected 403, got {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Get User Profile (Unauthenticated)", False, f"Unauthenticated profile test failed: {str(e)}")
@@ -337,14 +396,13 @@ class MediousAuthTester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
             # Use query parameters as the endpoint expects
             params = {
                 "name": "Updated Test User",
                 "avatar": "https://example.com/new-avatar.jpg"
             }
             
-            response = requests.put(f"{self.base_url}/users/profile", params=params, headers=headers, timeout=10)
+            response = self.session.put(f"{self.base_url}/users/profile", params=params, timeout=self._timeout())
             
             if response.status_code == 200:
                 data = response.json()
@@ -355,7 +413,7 @@ class MediousAuthTester:
                     self.log_result("Update User Profile", False, "Profile not updated correctly", data)
                     return False
             else:
-                self.log_result("Update User Profile", False, f"Profile update failed with status {response.status_code}", response.text)
+                self.log_result("Update User Profile", False, f"Profile update failed with status {response.status_code}", self._body_preview(response))
                 return False
         except Exception as e:
             self.log_result("Update User Profile", False, f"Profile update request failed: {str(e)}")
@@ -368,41 +426,70 @@ class MediousAuthTester:
         print(f"Test User Email: {self.test_user_email}")
         print("=" * 60)
         
-        # Test sequence
-        tests = [
-            self.test_api_health,
+        # Tests that share state (the registered user and its token) run in
+        # order; the stateless probes run together afterwards so the run is
+        # bounded by one round-trip instead of one per probe
+        sequential = [
             self.test_user_registration_valid,
             self.test_user_registration_duplicate,
             self.test_user_login_valid,
             self.test_user_login_invalid_password,
-            self.test_user_login_nonexistent_email,
             self.test_token_verification_valid,
-            self.test_token_verification_invalid,
             self.test_forgot_password_existing_email,
-            self.test_forgot_password_nonexistent_email,
-            self.test_supabase_oauth_sync_new_user,
             self.test_supabase_oauth_sync_existing_email,
             self.test_get_user_profile_authenticated,
-            self.test_get_user_profile_unauthenticated,
             self.test_update_user_profile
         ]
-        
+        concurrent = [
+            self.test_user_login_nonexistent_email,
+            self.test_token_verification_invalid,
+            self.test_forgot_password_nonexistent_email,
+            self.test_supabase_oauth_sync_new_user,
+            self.test_get_user_profile_unauthenticated
+        ]
+
         passed = 0
         failed = 0
-        
-        for test in tests:
+
+        def run_test(test):
             try:
-                if test():
-                    passed += 1
-                else:
-                    failed += 1
+                return bool(test())
             except Exception as e:
                 print(f"❌ FAIL {test.__name__}: Unexpected error - {str(e)}")
+                return False
+
+        # A dead backend would fail all fourteen remaining tests at full
+        # timeout each (~minutes of wasted wall time); bail out after the
+        # health check and record the rest as skipped
+        if not run_test(self.test_api_health):
+            for test in sequential + concurrent:
+                self.log_result(test.__name__, None, "skipped: API health check failed")
+            self.session.close()
+            self._results_fp.close()
+            print("=" * 60)
+            print("📊 Test Results: 0 passed, 1 failed (remaining tests skipped)")
+            return 0, 1, self.test_results
+
+        passed += 1
+
+        for test in sequential:
+            if run_test(test):
+                passed += 1
+            else:
                 failed += 1
-            
-            # Small delay between tests
-            time.sleep(0.5)
-        
+
+        # urllib3's connection pool is thread-safe, so the shared session
+        # serves all probes at once
+        with ThreadPoolExecutor(max_workers=len(concurrent)) as pool:
+            for ok in pool.map(run_test, concurrent):
+                if ok:
+                    passed += 1
+                else:
+                    failed += 1
+
+        self.session.close()
+        self._results_fp.close()
+
         print("=" * 60)
         print(f"📊 Test Results: {passed} passed, {failed} failed")
         
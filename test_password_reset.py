@@ -11,6 +11,27 @@ import time
 
 BACKEND_URL = "https://security-policy-fix-2.preview.emergentagent.com/api"
 
+# Shared session so the TLS handshake is paid once for the whole flow
+session = requests.Session()
+
+BACKEND_LOG = "/var/log/supervisor/backend.err.log"
+
+# Compiled once; matches any email so the same pattern serves every run
+TOKEN_RE = re.compile(rb"Password reset token for ([^:]+): ([A-Za-z0-9_-]+)")
+
+def find_reset_token(email: str) -> str | None:
+    """Scan the tail of the backend log for the reset token of `email`."""
+    with open(BACKEND_LOG, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - 8192))
+        tail = f.read()
+    token = None
+    for m in TOKEN_RE.finditer(tail):
+        if m.group(1).decode() == email:
+            token = m.group(2).decode()  # keep the last (freshest) match
+    return token
+
 def test_password_reset_flow():
     """Test complete password reset flow"""
     
@@ -26,7 +47,7 @@ def test_password_reset_flow():
         "name": "Reset Test User"
     }
     
-    response = requests.post(f"{BACKEND_URL}/auth/register", json=register_payload)
+    response = session.post(f"{BACKEND_URL}/auth/register", json=register_payload)
     if response.status_code != 200:
         print(f"❌ Registration failed: {response.text}")
         return False
@@ -36,7 +57,7 @@ def test_password_reset_flow():
     # Request password reset
     print("\n2. Requesting password reset...")
     reset_payload = {"email": test_email}
-    response = requests.post(f"{BACKEND_URL}/auth/forgot-password", json=reset_payload)
+    response = session.post(f"{BACKEND_URL}/auth/forgot-password", json=reset_payload)
     
     if response.status_code != 200:
         print(f"❌ Password reset request failed: {response.text}")
@@ -46,22 +67,15 @@ def test_password_reset_flow():
     
     # Check backend logs for reset token (in production this would be sent via email)
     print("\n3. Checking backend logs for reset token...")
-    import subprocess
     try:
-        result = subprocess.run(['tail', '-n', '20', '/var/log/supervisor/backend.err.log'], 
-                              capture_output=True, text=True)
-        logs = result.stdout
-        
-        # Look for reset token in logs
-        token_match = re.search(rf'Password reset token for {re.escape(test_email)}: ([a-f0-9-]+)', logs)
-        if not token_match:
+        reset_token = find_reset_token(test_email)
+        if not reset_token:
             print("❌ Reset token not found in logs")
             return False
-        
-        reset_token = token_match.group(1)
+
         print(f"✅ Found reset token: {reset_token[:20]}...")
-        
-    except Exception as e:
+
+    except OSError as e:
         print(f"❌ Error reading logs: {e}")
         return False
     
@@ -73,7 +87,7 @@ def test_password_reset_flow():
         "new_password": new_password
     }
     
-    response = requests.post(f"{BACKEND_URL}/auth/reset-password", json=reset_password_payload)
+    response = session.post(f"{BACKEND_URL}/auth/reset-password", json=reset_password_payload)
     if response.status_code != 200:
         print(f"❌ Password reset failed: {response.text}")
         return False
@@ -83,7 +97,7 @@ def test_password_reset_flow():
     # Test login with old password (should fail)
     print("\n5. Testing login with old password (should fail)...")
     login_payload = {"email": test_email, "password": test_password}
-    response = requests.post(f"{BACKEND_URL}/auth/login", json=login_payload)
+    response = session.post(f"{BACKEND_URL}/auth/login", json=login_payload)
     
     if response.status_code == 401:
         print("✅ Old password correctly rejected")
@@ -94,7 +108,7 @@ def test_password_reset_flow():
     # Test login with new password (should work)
     print("\n6. Testing login with new password (should work)...")
     login_payload = {"email": test_email, "password": new_password}
-    response = requests.post(f"{BACKEND_URL}/auth/login", json=login_payload)
+    response = session.post(f"{BACKEND_URL}/auth/login", json=login_payload)
     
     if response.status_code == 200:
         print("✅ New password works correctly")
@@ -113,7 +127,7 @@ def test_reset_password_invalid_token():
         "new_password": "NewPassword123!"
     }
     
-    response = requests.post(f"{BACKEND_URL}/auth/reset-password", json=invalid_payload)
+    response = session.post(f"{BACKEND_URL}/auth/reset-password", json=invalid_payload)
     
     if response.status_code == 400:
         print("✅ Invalid reset token correctly rejected")